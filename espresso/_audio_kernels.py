@@ -0,0 +1,102 @@
+"""
+Compiled kernels for the audio callback
+
+Uses numba when available, otherwise falls back to equivalent NumPy code.
+"""
+import numpy as np
+
+from ._jit import compile_kernel
+
+# Explicit signature so numba compiles (or loads from its on-disk cache) on
+# import rather than inside the first audio callback
+_RMS_AND_PEAK_SIG = '(float32[:, :],)'
+_RING_WRITE_SIG = '(float32[:], int64, float32[:, :])'
+
+
+def _rms_and_peak_loop(x):
+    n = x.shape[0]
+    s = 0.0
+    p = 0.0
+    for i in range(n):
+        v = x[i, 0]
+        s += v * v
+        av = abs(v)
+        if av > p:
+            p = av
+    if n == 0:
+        return 0.0, 0.0
+    return np.sqrt(s / n), p
+
+
+def _ring_write_loop(ring, write_idx, x):
+    size = ring.shape[0]
+    n = x.shape[0]
+    s = 0.0
+    idx = write_idx
+    for i in range(n):
+        v = x[i, 0]
+        ring[idx] = v
+        s += v * v
+        idx += 1
+        if idx == size:
+            idx = 0
+    if n == 0:
+        return idx, 0.0
+    return idx, np.sqrt(s / n)
+
+
+def _rms_and_peak_numpy(x):
+    channel = x[:, 0]
+    if channel.size == 0:
+        return 0.0, 0.0
+    return np.sqrt(np.mean(channel * channel)), np.max(np.abs(channel))
+
+
+def _ring_write_numpy(ring, write_idx, x):
+    channel = x[:, 0]
+    n = channel.size
+    if n == 0:
+        return write_idx, 0.0
+    size = ring.shape[0]
+
+    # Only the newest size samples survive; write them in at most two slices
+    tail = channel[-size:]
+    start = (write_idx + n - len(tail)) % size
+    first = min(len(tail), size - start)
+    ring[start:start + first] = tail[:first]
+    ring[:len(tail) - first] = tail[first:]
+    return (write_idx + n) % size, np.sqrt(np.mean(channel * channel))
+
+
+_rms_and_peak_impl = compile_kernel(_rms_and_peak_loop, _RMS_AND_PEAK_SIG, _rms_and_peak_numpy)
+_ring_write_impl = compile_kernel(_ring_write_loop, _RING_WRITE_SIG, _ring_write_numpy)
+
+
+def rms_and_peak(x: np.ndarray):
+    """
+    RMS and absolute peak of the first channel in one pass
+
+    Args:
+        x: Audio block of shape (frames, channels)
+
+    Returns:
+        Tuple of (rms, peak)
+    """
+    rms, peak = _rms_and_peak_impl(np.asarray(x, dtype=np.float32))
+    return float(rms), float(peak)
+
+
+def ring_write(ring: np.ndarray, write_idx: int, x: np.ndarray):
+    """
+    Append the first channel of a block to a ring buffer and compute its RMS
+
+    Args:
+        ring: float32 ring buffer, updated in place
+        write_idx: Position of the next write in ring
+        x: Audio block of shape (frames, channels)
+
+    Returns:
+        Tuple of (new write_idx, rms)
+    """
+    write_idx, rms = _ring_write_impl(ring, int(write_idx), np.asarray(x, dtype=np.float32))
+    return int(write_idx), float(rms)
@@ -0,0 +1,265 @@
+"""
+Compiled kernels for audio fingerprinting
+
+Uses numba when available, otherwise falls back to equivalent NumPy code.
+"""
+import numpy as np
+
+from ._jit import compile_kernel, prange
+
+# Block size for the NumPy edge scan in find_active
+_EDGE_BLOCK = 4096
+
+# Explicit signatures so numba compiles (or loads from its on-disk cache) when
+# this module is imported instead of on the first call
+_SCAN_SIG = '(float32[:], int64, int64)'
+_FIND_ACTIVE_SIG = '(float32[:], float64)'
+_SCORE_ALL_SIG = ('(float64, float64, float64[:], float64[:], boolean, float32[:], float32[:], '
+                  'float32[:, :], int64[:], float32[:, :], boolean[:], float64[:])')
+
+
+def _scan_loop(samples, chunk_size, max_chunks):
+    n = samples.shape[0]
+    n_chunks = min((n + chunk_size - 1) // chunk_size, max_chunks)
+    rms_profile = np.empty(n_chunks, dtype=np.float32)
+    peak = 0.0
+    sum_abs = 0.0
+
+    # Chunks that end up in the RMS profile
+    for c in range(n_chunks):
+        start = c * chunk_size
+        end = min(start + chunk_size, n)
+        sumsq = 0.0
+        for i in range(start, end):
+            x = samples[i]
+            sumsq += x * x
+            ax = abs(x)
+            sum_abs += ax
+            if ax > peak:
+                peak = ax
+        rms_profile[c] = np.sqrt(sumsq / (end - start))
+
+    # Remaining samples only contribute to peak and mean
+    for i in range(n_chunks * chunk_size, n):
+        ax = abs(samples[i])
+        sum_abs += ax
+        if ax > peak:
+            peak = ax
+
+    mean_abs = sum_abs / n if n > 0 else 0.0
+    return rms_profile, peak, mean_abs
+
+
+def _find_active_loop(samples, threshold):
+    n = samples.shape[0]
+
+    # Scan inwards from both ends and stop at the first crossing
+    start_idx = -1
+    for i in range(n):
+        if abs(samples[i]) > threshold:
+            start_idx = i
+            break
+    if start_idx < 0:
+        return -1, -1
+
+    for i in range(n - 1, start_idx - 1, -1):
+        if abs(samples[i]) > threshold:
+            return start_idx, i + 1
+    return start_idx, start_idx + 1
+
+
+def _scan_numpy(samples, chunk_size, max_chunks):
+    # Match the loop kernel, which reports zero levels for empty input
+    if len(samples) == 0:
+        return np.empty(0, dtype=np.float32), 0.0, 0.0
+
+    head = samples[:chunk_size * max_chunks]
+    n_full = len(head) // chunk_size
+
+    # Full chunks as one 2-D view, the partial tail chunk separately
+    block = head[:n_full * chunk_size].reshape(n_full, chunk_size)
+    rms_profile = np.sqrt(np.mean(block * block, axis=1))
+    tail = head[n_full * chunk_size:]
+    if len(tail) > 0:
+        rms_profile = np.append(rms_profile, np.sqrt(np.mean(tail * tail)))
+    rms_profile = rms_profile.astype(np.float32, copy=False)
+    abs_samples = np.abs(samples)
+    return rms_profile, float(np.max(abs_samples)), float(np.mean(abs_samples))
+
+
+def _find_active_numpy(samples, threshold):
+    # Scan blocks inwards from both ends so only the edges get materialized
+    n = len(samples)
+    start_idx = -1
+    for lo in range(0, n, _EDGE_BLOCK):
+        hits = np.flatnonzero(np.abs(samples[lo:lo + _EDGE_BLOCK]) > threshold)
+        if hits.size:
+            start_idx = lo + int(hits[0])
+            break
+    if start_idx < 0:
+        return -1, -1
+
+    for hi in range(n, start_idx, -_EDGE_BLOCK):
+        lo = max(hi - _EDGE_BLOCK, start_idx)
+        hits = np.flatnonzero(np.abs(samples[lo:hi]) > threshold)
+        if hits.size:
+            return start_idx, lo + int(hits[-1]) + 1
+    return start_idx, start_idx + 1
+
+
+def _score_all_loop(q_dur, q_peak, q_rms, q_energy, q_has_energy,
+                    dur, peak, rms, rms_len, energy, has_energy, out):
+    for i in prange(dur.shape[0]):
+        total = 0.0
+        used = 0
+
+        # Active duration (weighted 2x) and peak level
+        if dur[i] > 0 and q_dur > 0:
+            diff = abs(dur[i] - q_dur) / max(dur[i], q_dur)
+            total += max(0.0, 1.0 - diff * 2)
+            used += 1
+        if peak[i] > 0 and q_peak > 0:
+            diff = abs(peak[i] - q_peak) / max(peak[i], q_peak)
+            total += max(0.0, 1.0 - diff)
+            used += 1
+
+        # Pearson correlation of RMS profiles over their common length
+        m = min(rms_len[i], q_rms.shape[0])
+        if m > 0:
+            mean_q = 0.0
+            mean_r = 0.0
+            for j in range(m):
+                mean_q += q_rms[j]
+                mean_r += rms[i, j]
+            mean_q /= m
+            mean_r /= m
+            s_ab = 0.0
+            s_aa = 0.0
+            s_bb = 0.0
+            for j in range(m):
+                a = q_rms[j] - mean_q
+                b = rms[i, j] - mean_r
+                s_ab += a * b
+                s_aa += a * a
+                s_bb += b * b
+            denom = np.sqrt(s_aa * s_bb)
+            if denom > 0:
+                total += min(1.0, max(-1.0, s_ab / denom))
+                used += 1
+
+        # Energy distribution
+        if q_has_energy and has_energy[i]:
+            diff = 0.0
+            for k in range(3):
+                diff += abs(energy[i, k] - q_energy[k])
+            total += max(0.0, 1.0 - diff / 3)
+            used += 1
+
+        out[i] = total / used if used > 0 else 0.0
+
+
+def _score_all_numpy(q_dur, q_peak, q_rms, q_energy, q_has_energy,
+                     dur, peak, rms, rms_len, energy, has_energy, out):
+    total = np.zeros(len(dur))
+    used = np.zeros(len(dur))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Active duration (weighted 2x) and peak level
+        for stored, value, weight in ((dur, q_dur, 2), (peak, q_peak, 1)):
+            valid = (stored > 0) & (value > 0)
+            diff = np.abs(stored - value) / np.maximum(stored, value)
+            total += np.where(valid, np.maximum(0, 1 - diff * weight), 0)
+            used += valid
+
+        # Pearson correlation of RMS profiles over their common length. It is
+        # scale invariant, so compare_fingerprints' max-normalization is not needed.
+        width = rms.shape[1]
+        common = np.minimum(rms_len, len(q_rms))
+        mask = np.arange(width) < common[:, None]
+        padded = np.zeros(width)
+        padded[:len(q_rms)] = q_rms[:width]
+
+        q = np.where(mask, padded, 0)
+        r = np.where(mask, rms, 0).astype(np.float64)
+        q = np.where(mask, q - (q.sum(axis=1) / common)[:, None], 0)
+        r = np.where(mask, r - (r.sum(axis=1) / common)[:, None], 0)
+        correlation = (q * r).sum(axis=1) / np.sqrt((q * q).sum(axis=1) * (r * r).sum(axis=1))
+        valid = (common > 0) & np.isfinite(correlation)
+        total += np.where(valid, np.clip(correlation, -1, 1), 0)
+        used += valid
+
+    # Energy distribution
+    if q_has_energy:
+        diff = np.abs(energy - q_energy).mean(axis=1)
+        total += np.where(has_energy, np.maximum(0, 1 - diff), 0)
+        used += has_energy
+
+    out[:] = np.where(used > 0, total / np.maximum(used, 1), 0.0)
+
+
+_scan_impl = compile_kernel(_scan_loop, _SCAN_SIG, _scan_numpy)
+_find_active_impl = compile_kernel(_find_active_loop, _FIND_ACTIVE_SIG, _find_active_numpy)
+_score_all_impl = compile_kernel(_score_all_loop, _SCORE_ALL_SIG, _score_all_numpy, parallel=True)
+
+
+def scan(samples: np.ndarray, chunk_size: int, max_chunks: int):
+    """
+    Single pass over samples for level statistics
+
+    Args:
+        samples: 1-D audio samples
+        chunk_size: Samples per RMS chunk
+        max_chunks: Maximum number of RMS chunks to compute
+
+    Returns:
+        Tuple of (rms_profile, peak_level, mean_level)
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    rms_profile, peak, mean_abs = _scan_impl(samples, int(chunk_size), int(max_chunks))
+    return rms_profile, float(peak), float(mean_abs)
+
+
+def find_active(samples: np.ndarray, threshold: float):
+    """
+    Find the first and last sample above threshold
+
+    Args:
+        samples: 1-D audio samples
+        threshold: Absolute amplitude threshold
+
+    Returns:
+        Tuple of (start_idx, end_idx) with end exclusive, or (-1, -1) if
+        no sample exceeds the threshold
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    start_idx, end_idx = _find_active_impl(samples, float(threshold))
+    return int(start_idx), int(end_idx)
+
+
+def score_all(q_dur: float, q_peak: float, q_rms: np.ndarray, q_energy: np.ndarray,
+              q_has_energy: bool, dur: np.ndarray, peak: np.ndarray, rms: np.ndarray,
+              rms_len: np.ndarray, energy: np.ndarray, has_energy: np.ndarray) -> np.ndarray:
+    """
+    Similarity of one fingerprint to every stored fingerprint
+
+    Same component scores as AudioFingerprint.compare_fingerprints, averaged
+    over the components available for each pair.
+
+    Args:
+        q_dur, q_peak: Active duration and peak level of the query
+        q_rms: RMS profile of the query (float64)
+        q_energy: Low/mid/high energy shares of the query
+        q_has_energy: Whether the query has an energy distribution
+        dur, peak: Stored active durations and peak levels, shape (M,)
+        rms: Stored RMS profiles zero-padded to shape (M, width)
+        rms_len: Real length of each stored RMS profile, shape (M,)
+        energy: Stored energy shares, shape (M, 3)
+        has_energy: Whether each stored fingerprint has energy shares
+
+    Returns:
+        Array of M similarity scores
+    """
+    out = np.empty(len(dur))
+    _score_all_impl(float(q_dur), float(q_peak), q_rms, q_energy, bool(q_has_energy),
+                    dur, peak, rms, rms_len, energy, has_energy, out)
+    return out
@@ -0,0 +1,50 @@
+"""
+Numba compilation shared by the kernel modules
+
+Any kernel that cannot be compiled falls back to its NumPy implementation,
+so a broken or missing numba never stops the app from starting.
+"""
+import logging
+import sys
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    prange = range
+    NUMBA_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Frozen (PyInstaller) builds ship no .py sources, so numba cannot locate an
+# on-disk cache for the kernels there
+_CACHE = not getattr(sys, 'frozen', False)
+
+
+def compile_kernel(loop, signature: str, fallback, **options):
+    """
+    Compile a kernel eagerly with numba, or return its fallback
+
+    Args:
+        loop: Pure-Python loop implementation to compile
+        signature: Explicit numba signature, compiled right away
+        fallback: Equivalent NumPy implementation
+        **options: Extra njit options (e.g. parallel=True)
+
+    Returns:
+        The compiled kernel, or fallback if numba is missing or fails
+    """
+    if not NUMBA_AVAILABLE:
+        return fallback
+
+    # Retry without the on-disk cache before giving up on numba
+    if _CACHE:
+        try:
+            return njit(signature, cache=True, fastmath=True, **options)(loop)
+        except Exception as e:
+            logger.info(f"Could not cache {loop.__name__}, compiling without cache: {e}")
+    try:
+        return njit(signature, fastmath=True, **options)(loop)
+    except Exception as e:
+        logger.warning(f"Could not compile {loop.__name__}, using NumPy fallback: {e}")
+        return fallback
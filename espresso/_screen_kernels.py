@@ -0,0 +1,86 @@
+"""
+Compiled kernels for screen notification detection
+
+Uses numba when available, otherwise falls back to equivalent NumPy code.
+"""
+import numpy as np
+
+from ._jit import compile_kernel, prange
+
+# Rows counted between checks against the early-exit limit
+_ROW_BLOCK = 64
+
+# Explicit signature so numba compiles (or loads from its on-disk cache) when
+# this module is imported instead of on the first scan
+_COUNT_MATCHES_SIG = '(uint8[:, :, :], int64[:], uint8[:], uint8[:], int64, int64)'
+
+
+def _count_matches_loop(pixels, target, lo, hi, tol_sq, limit):
+    height = pixels.shape[0]
+    width = pixels.shape[1]
+    count = 0
+    for start in range(0, height, _ROW_BLOCK):
+        end = min(start + _ROW_BLOCK, height)
+        block_count = 0
+        for i in prange(start, end):
+            for j in range(width):
+                c0 = pixels[i, j, 0]
+                c1 = pixels[i, j, 1]
+                c2 = pixels[i, j, 2]
+
+                # Box around the target color first, exact distance only inside it
+                if (c0 < lo[0] or c0 > hi[0] or c1 < lo[1] or c1 > hi[1] or
+                        c2 < lo[2] or c2 > hi[2]):
+                    continue
+                d0 = np.int64(c0) - target[0]
+                d1 = np.int64(c1) - target[1]
+                d2 = np.int64(c2) - target[2]
+                if d0 * d0 + d1 * d1 + d2 * d2 <= tol_sq:
+                    block_count += 1
+        count += block_count
+        if limit > 0 and count >= limit:
+            break
+    return count
+
+
+def _count_matches_numpy(pixels, target, lo, hi, tol_sq, limit):
+    count = 0
+    for start in range(0, pixels.shape[0], _ROW_BLOCK):
+        block = pixels[start:start + _ROW_BLOCK]
+
+        # Box around the target color, using only uint8 comparisons
+        mask = ((block[:, :, 0] >= lo[0]) & (block[:, :, 0] <= hi[0]) &
+                (block[:, :, 1] >= lo[1]) & (block[:, :, 1] <= hi[1]) &
+                (block[:, :, 2] >= lo[2]) & (block[:, :, 2] <= hi[2]))
+
+        # Exact distance test on the remaining candidates
+        diff = block[:, :, :3][mask].astype(np.int64) - target
+        distance_sq = np.einsum('...c,...c->...', diff, diff)
+        count += np.count_nonzero(distance_sq <= tol_sq)
+        if limit > 0 and count >= limit:
+            break
+    return count
+
+
+_count_matches_impl = compile_kernel(_count_matches_loop, _COUNT_MATCHES_SIG,
+                                     _count_matches_numpy, parallel=True)
+
+
+def count_matches(pixels: np.ndarray, target: np.ndarray, lo: np.ndarray,
+                  hi: np.ndarray, tol_sq: int, limit: int = 0) -> int:
+    """
+    Count pixels within a Euclidean distance of a target color
+
+    Args:
+        pixels: Image of shape (height, width, channels); the first three
+            channels are compared
+        target: Target color as int64, in the same channel order as pixels
+        lo, hi: Per-channel bounds (uint8) of the box around target
+        tol_sq: Squared distance tolerance
+        limit: Stop counting once at least this many pixels matched (0 counts
+            the whole image)
+
+    Returns:
+        Number of matching pixels, possibly cut short at limit
+    """
+    return int(_count_matches_impl(pixels, target, lo, hi, int(tol_sq), int(limit)))
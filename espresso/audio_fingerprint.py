@@ -2,11 +2,69 @@
 Audio fingerprinting for identifying specific notification sounds
 """
 import json
+import functools
+import os
 import numpy as np
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from scipy.signal import welch
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+from ._fingerprint_kernels import find_active, scan, score_all
+
+# Number of 10ms RMS chunks kept in a fingerprint (first 500ms)
+RMS_PROFILE_CHUNKS = 50
+
+# Fingerprint fields stored in the binary .npz index; everything else is
+# metadata kept in the JSON file
+INDEX_FIELDS = ("active_duration", "peak_level", "mean_level",
+                "rms_profile", "energy_distribution")
+ENERGY_BANDS = ("low", "mid", "high")
+
+# Segment length for the averaged (Welch) power spectrum
+WELCH_SEGMENT = 1024
+
+
+@functools.lru_cache(maxsize=8)
+def _freq_layout(n: int, sample_rate: int) -> Tuple[np.ndarray, int, int]:
+    """Bin frequencies for an n-point rFFT and the 500 Hz / 2 kHz band edges"""
+    freqs = np.fft.rfftfreq(n, 1/sample_rate)
+    return freqs, int(np.searchsorted(freqs, 500)), int(np.searchsorted(freqs, 2000))
+
+
+def _welch(samples: np.ndarray, sample_rate: int, nperseg: int) -> np.ndarray:
+    """
+    Power spectral density averaged over 50% overlapping Hann windows
+
+    Uses scipy.signal.welch when available, otherwise an equivalent NumPy
+    implementation (up to a constant scale factor).
+    """
+    if SCIPY_AVAILABLE:
+        _, psd = welch(samples, fs=sample_rate, window='hann',
+                       nperseg=nperseg, noverlap=nperseg // 2)
+        return psd
+
+    step = nperseg - nperseg // 2
+    segments = np.lib.stride_tricks.sliding_window_view(samples, nperseg)[::step]
+    segments = segments - segments.mean(axis=1, keepdims=True)
+    window = np.hanning(nperseg + 1)[:-1].astype(samples.dtype)
+    spectrum = np.fft.rfft(segments * window, axis=1)
+    psd = (spectrum.real * spectrum.real + spectrum.imag * spectrum.imag).mean(axis=0)
+
+    # One-sided spectrum: double everything but DC (and Nyquist if present)
+    psd[1:len(psd) - (nperseg % 2 == 0)] *= 2
+    return psd
+
 
 class AudioFingerprint:
     """Create and compare audio fingerprints"""
@@ -24,28 +82,177 @@ class AudioFingerprint:
         self.config_dir = config_dir
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.fingerprint_file = config_dir / "audio_fingerprints.json"
+        self.index_file = config_dir / "audio_fingerprints.npz"
 
         # Load existing fingerprints
         self.fingerprints = self.load_fingerprints()
+        self._build_index()
 
     def load_fingerprints(self) -> Dict:
-        """Load fingerprints from disk"""
+        """
+        Load fingerprints from disk
+
+        Metadata comes from the JSON file, which also lists the known
+        sounds. Numeric features come from the .npz index; entries that
+        still carry them in the JSON file (older stores) are used as-is.
+        Entries with no features anywhere are kept (with a warning) so
+        that saving does not drop them from the JSON file.
+        """
+        metadata = {}
         if self.fingerprint_file.exists():
             try:
-                with open(self.fingerprint_file, 'r') as f:
-                    return json.load(f)
+                data = self.fingerprint_file.read_bytes()
+                metadata = orjson.loads(data) if orjson is not None else json.loads(data)
             except Exception as e:
                 print(f"Warning: Could not load fingerprints: {e}")
+                return {}
 
-        return {}
+        index = {}
+        if self.index_file.exists():
+            try:
+                with np.load(self.index_file) as data:
+                    index = {key: data[key] for key in data.files}
+            except Exception as e:
+                # Keep the unreadable file for recovery; the next save would
+                # otherwise replace it
+                backup = self.index_file.with_name(self.index_file.name + ".corrupt")
+                print(f"Warning: Could not load fingerprint index: {e}")
+                try:
+                    os.replace(self.index_file, backup)
+                    print(f"   Moved it to {backup}")
+                except OSError as e:
+                    print(f"   Could not move it aside: {e}")
+
+        rows = {str(name): i for i, name in enumerate(index.get("names", []))}
+        fingerprints = {}
+
+        for name, meta in metadata.items():
+            if name in rows:
+                i = rows[name]
+                fp = dict(meta)
+                fp["active_duration"] = float(index["dur"][i])
+                fp["peak_level"] = float(index["peak"][i])
+                fp["mean_level"] = float(index["mean"][i])
+                fp["rms_profile"] = index["rms"][i, :index["rms_len"][i]].tolist()
+                if index["has_energy"][i]:
+                    fp["energy_distribution"] = dict(
+                        zip(ENERGY_BANDS, index["energy"][i].tolist())
+                    )
+                fingerprints[name] = fp
+            else:
+                if "rms_profile" not in meta:
+                    print(f"⚠️  Warning: No audio features stored for sound '{name}' "
+                          f"({self.index_file.name} missing or damaged)")
+                    print("   It will not be identified until it is learned again")
+                fingerprints[name] = meta
+
+        return fingerprints
 
     def save_fingerprints(self):
-        """Save fingerprints to disk"""
+        """
+        Save numeric features as .npz, then metadata as JSON
+
+        The JSON file no longer carries the features, so it is only written
+        once the index is safely in place. Both files are written to a
+        temporary file first and then renamed over the old one.
+        """
+        # Callers may have changed self.fingerprints since the last rebuild
+        self._build_index()
+
+        metadata = {
+            name: {k: v for k, v in fp.items() if k not in INDEX_FIELDS}
+            for name, fp in self.fingerprints.items()
+        }
+
+        index_tmp = self.index_file.with_name(self.index_file.name + ".tmp")
+        json_tmp = self.fingerprint_file.with_name(self.fingerprint_file.name + ".tmp")
+        # Sounds without features get no index row, rather than a row of
+        # zeros that would look like real features on the next load
+        rows = np.array(["rms_profile" in fp for fp in self.fingerprints.values()], dtype=bool)
+
         try:
-            with open(self.fingerprint_file, 'w') as f:
-                json.dump(self.fingerprints, f, indent=2)
+            with open(index_tmp, 'wb') as f:
+                np.savez(
+                    f,
+                    names=np.array(self._names, dtype=str)[rows],
+                    dur=self._dur[rows],
+                    peak=self._peak[rows],
+                    mean=self._mean[rows],
+                    rms=self._rms[rows],
+                    rms_len=self._rms_len[rows],
+                    energy=self._energy[rows],
+                    has_energy=self._has_energy[rows],
+                )
+            os.replace(index_tmp, self.index_file)
+
+            if orjson is not None:
+                data = orjson.dumps(
+                    metadata,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                )
+            else:
+                data = json.dumps(metadata, indent=2).encode()
+            json_tmp.write_bytes(data)
+            os.replace(json_tmp, self.fingerprint_file)
         except Exception as e:
             print(f"Warning: Could not save fingerprints: {e}")
+            for tmp in (index_tmp, json_tmp):
+                tmp.unlink(missing_ok=True)
+
+    def _build_index(self):
+        """Store the fingerprint library as per-field arrays for batch scoring"""
+        stored = list(self.fingerprints.values())
+        count = len(stored)
+
+        self._names = list(self.fingerprints.keys())
+        self._dur = np.array(
+            [fp.get("active_duration", 0) for fp in stored], dtype=np.float32
+        )
+        self._peak = np.array(
+            [fp.get("peak_level", 0) for fp in stored], dtype=np.float32
+        )
+        self._mean = np.array(
+            [fp.get("mean_level", 0) for fp in stored], dtype=np.float32
+        )
+
+        # RMS profiles zero-padded to a fixed width, with their real lengths
+        self._rms = np.zeros((count, RMS_PROFILE_CHUNKS), dtype=np.float32)
+        self._rms_len = np.zeros(count, dtype=np.int64)
+        for i, fp in enumerate(stored):
+            profile = fp.get("rms_profile", [])[:RMS_PROFILE_CHUNKS]
+            self._rms[i, :len(profile)] = profile
+            self._rms_len[i] = len(profile)
+
+        self._energy = np.array(
+            [[fp.get("energy_distribution", {}).get(band, 0)
+              for band in ENERGY_BANDS] for fp in stored],
+            dtype=np.float32
+        ).reshape(count, 3)
+        self._has_energy = np.array(
+            [bool(fp.get("energy_distribution")) for fp in stored], dtype=bool
+        )
+
+    def _score_library(self, fp: Dict) -> np.ndarray:
+        """
+        Score a fingerprint against every stored fingerprint at once
+
+        Batch equivalent of compare_fingerprints over the library.
+
+        Args:
+            fp: Fingerprint to score
+
+        Returns:
+            Array of similarity scores, one per stored fingerprint
+        """
+        query = np.asarray(fp.get("rms_profile", []), dtype=np.float64)[:RMS_PROFILE_CHUNKS]
+        energy = fp.get("energy_distribution", {})
+        query_energy = np.array([energy.get(band, 0) for band in ENERGY_BANDS], dtype=np.float64)
+
+        return score_all(
+            fp.get("active_duration", 0), fp.get("peak_level", 0), query,
+            query_energy, bool(energy), self._dur, self._peak, self._rms,
+            self._rms_len, self._energy, self._has_energy
+        )
 
     def create_fingerprint(self, audio_samples: np.ndarray, sample_rate: int) -> Dict:
         """
@@ -58,53 +265,53 @@ class AudioFingerprint:
         Returns:
             Dictionary with fingerprint characteristics
         """
+        # Work in float32 throughout - the reductions and FFT are memory-bound
+        if audio_samples.dtype != np.float32:
+            audio_samples = audio_samples.astype(np.float32)
+
         # Calculate basic characteristics
         duration = len(audio_samples) / sample_rate
 
-        # RMS levels over time (split into 10ms chunks)
+        # RMS profile, peak and mean level in a single pass
         chunk_size = int(0.01 * sample_rate)  # 10ms chunks
-        rms_profile = []
-
-        for i in range(0, len(audio_samples), chunk_size):
-            chunk = audio_samples[i:i+chunk_size]
-            if len(chunk) > 0:
-                rms = float(np.sqrt(np.mean(chunk**2)))
-                rms_profile.append(rms)
-
-        # Peak characteristics
-        peak_level = float(np.max(np.abs(audio_samples)))
-        mean_level = float(np.mean(np.abs(audio_samples)))
+        rms_profile, peak_level, mean_level = scan(
+            audio_samples, chunk_size, RMS_PROFILE_CHUNKS
+        )
 
         # Find where audio starts and ends (above threshold)
         threshold = mean_level * 2
-        above_threshold = np.abs(audio_samples) > threshold
+        start_idx, end_idx = find_active(audio_samples, threshold)
 
-        if np.any(above_threshold):
-            start_idx = np.argmax(above_threshold)
-            end_idx = len(audio_samples) - np.argmax(above_threshold[::-1])
+        if start_idx >= 0:
             active_duration = (end_idx - start_idx) / sample_rate
         else:
             active_duration = 0.0
 
-        # FFT for frequency analysis (simplified - just get dominant frequencies)
-        fft = np.fft.rfft(audio_samples)
-        freqs = np.fft.rfftfreq(len(audio_samples), 1/sample_rate)
-        magnitudes = np.abs(fft)
+        # Frequency analysis on a Welch-averaged power spectrum - only the
+        # dominant bins and band shares are needed, not full resolution
+        nperseg = min(WELCH_SEGMENT, len(audio_samples))
+        power = _welch(audio_samples, sample_rate, nperseg)
+        freqs, i500, i2000 = _freq_layout(nperseg, sample_rate)
 
         # Get top 5 frequencies
-        top_freq_indices = np.argsort(magnitudes)[-5:]
+        if len(power) > 5:
+            top_idx = np.argpartition(power, -5)[-5:]
+            top_freq_indices = top_idx[np.argsort(power[top_idx])]
+        else:
+            top_freq_indices = np.argsort(power)
         top_frequencies = [float(freqs[i]) for i in top_freq_indices]
 
-        # Energy distribution (low, mid, high)
-        low_band = magnitudes[freqs < 500]
-        mid_band = magnitudes[(freqs >= 500) & (freqs < 2000)]
-        high_band = magnitudes[freqs >= 2000]
+        # Energy distribution (low, mid, high) - freqs is sorted, so each
+        # band is a contiguous slice
+        low_sum = float(np.sum(power[:i500]))
+        mid_sum = float(np.sum(power[i500:i2000]))
+        high_sum = float(np.sum(power[i2000:]))
 
-        total_energy = np.sum(magnitudes)
+        total_energy = low_sum + mid_sum + high_sum
         if total_energy > 0:
-            low_energy = float(np.sum(low_band) / total_energy)
-            mid_energy = float(np.sum(mid_band) / total_energy)
-            high_energy = float(np.sum(high_band) / total_energy)
+            low_energy = low_sum / total_energy
+            mid_energy = mid_sum / total_energy
+            high_energy = high_sum / total_energy
         else:
             low_energy = mid_energy = high_energy = 0.0
 
@@ -113,7 +320,7 @@ class AudioFingerprint:
             "active_duration": float(active_duration),
             "peak_level": peak_level,
             "mean_level": mean_level,
-            "rms_profile": rms_profile[:50],  # Limit to first 500ms
+            "rms_profile": rms_profile.tolist(),
             "top_frequencies": top_frequencies,
             "energy_distribution": {
                 "low": low_energy,
@@ -169,10 +376,12 @@ class AudioFingerprint:
             if np.max(rms2) > 0:
                 rms2 = rms2 / np.max(rms2)
 
-            # Calculate correlation
-            correlation = np.corrcoef(rms1, rms2)[0, 1]
-            if not np.isnan(correlation):
-                scores.append(float(correlation))
+            # Calculate Pearson correlation
+            a = rms1 - rms1.mean()
+            b = rms2 - rms2.mean()
+            denom = np.sqrt((a @ a) * (b @ b))
+            if denom > 0:
+                scores.append(float(np.clip((a @ b) / denom, -1, 1)))
 
         # Compare energy distribution
         energy1 = fp1.get("energy_distribution", {})
@@ -208,18 +417,19 @@ class AudioFingerprint:
         # Create fingerprint for this sound
         fp = self.create_fingerprint(audio_samples, sample_rate)
 
-        # Compare with all known fingerprints
-        best_match = None
-        best_score = 0.0
+        if not self._names:
+            return None, 0.0
+
+        # Compare with all known fingerprints in one batch
+        scores = self._score_library(fp)
+        best = int(np.argmax(scores))
+        best_score = float(scores[best])
 
-        for name, stored_fp in self.fingerprints.items():
-            score = self.compare_fingerprints(fp, stored_fp)
-            if score > best_score:
-                best_score = score
-                best_match = name
+        if best_score <= 0:
+            return None, 0.0
 
         if best_score >= min_confidence:
-            return best_match, best_score
+            return self._names[best], best_score
 
         return None, best_score
 
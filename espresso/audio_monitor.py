@@ -4,7 +4,6 @@ Audio monitoring for detecting notifications and calls
 import threading
 import time
 import numpy as np
-from datetime import datetime, timedelta
 from typing import Callable, Optional
 
 try:
@@ -12,6 +11,8 @@ try:
 except ImportError:
     sd = None
 
+from ._audio_kernels import rms_and_peak
+
 
 class AudioMonitor:
     """Monitor system audio for notification sounds and calls"""
@@ -53,7 +54,7 @@ class AudioMonitor:
         self.monitor_thread = None
         self.stream = None
 
-        # Detection state
+        # Detection state (time.monotonic() timestamps)
         self.last_notification_time = None
         self.call_start_time = None
         self.in_call = False
@@ -94,24 +95,25 @@ class AudioMonitor:
 
     def calculate_rms(self, audio_data):
         """Calculate RMS (Root Mean Square) of audio data"""
-        return np.sqrt(np.mean(audio_data**2))
+        rms, _ = rms_and_peak(audio_data)
+        return rms
 
     def audio_callback(self, indata, frames, time_info, status):
         """Callback for audio stream"""
         if status:
             print(f"Audio status: {status}")
 
-        # Calculate RMS level
-        rms = self.calculate_rms(indata)
+        # Calculate RMS in one pass, without an indata**2 temporary
+        rms, _ = rms_and_peak(indata)
 
         # Track peak level for short sound detection
-        now = datetime.now()
+        now = time.monotonic()
         if rms > self.peak_level:
             self.peak_level = rms
             self.last_peak_time = now
 
         # Reset peak after 0.5 seconds
-        if self.last_peak_time and (now - self.last_peak_time).total_seconds() > 0.5:
+        if self.last_peak_time is not None and now - self.last_peak_time > 0.5:
             self.peak_level = 0.0
             self.last_peak_time = None
 
@@ -120,7 +122,7 @@ class AudioMonitor:
         if detection_level > self.notification_threshold:
             # Check cooldown to avoid duplicate notifications
             if (self.last_notification_time is None or
-                (now - self.last_notification_time).total_seconds() > self.notification_cooldown):
+                now - self.last_notification_time > self.notification_cooldown):
 
                 self.last_notification_time = now
 
@@ -134,13 +136,11 @@ class AudioMonitor:
 
         # Check for call (sustained audio)
         if rms > self.call_threshold:
-            now = datetime.now()
-
             if self.call_start_time is None:
                 self.call_start_time = now
             else:
                 # Check if audio has been sustained long enough
-                duration = (now - self.call_start_time).total_seconds()
+                duration = now - self.call_start_time
 
                 if duration >= self.call_duration and not self.in_call:
                     self.in_call = True
@@ -168,6 +168,9 @@ class AudioMonitor:
 
         self.running = True
 
+        # Compile the level kernel now so the first callback doesn't stall
+        rms_and_peak(np.zeros((self.block_size, 1), dtype=np.float32))
+
         # Find device
         device_id = None
         if self.device_name:
@@ -180,6 +183,7 @@ class AudioMonitor:
             self.stream = sd.InputStream(
                 device=device_id,
                 channels=1,
+                dtype='float32',
                 samplerate=self.sample_rate,
                 blocksize=self.block_size,
                 callback=self.audio_callback
@@ -80,6 +80,27 @@ Examples:
     return parser.parse_args()
 
 
+def wait_for_next_tick(deadline: float, interval: float) -> float:
+    """
+    Sleep until the next tick of a fixed-rate schedule
+
+    Args:
+        deadline: Monotonic time of the current tick
+        interval: Seconds between ticks
+
+    Returns:
+        Monotonic time of the tick that was waited for
+    """
+    deadline += interval
+    now = time.monotonic()
+    # After a long stall (e.g. system sleep) start a fresh schedule instead
+    # of firing the missed ticks back to back
+    if now - deadline > 2 * interval:
+        deadline = now + interval
+    time.sleep(max(0.0, deadline - now))
+    return deadline
+
+
 def run_keepalive(core: EspressoCore):
     """Main keepalive loop"""
     EspressoCore.log(f"Espresso started")
@@ -87,6 +108,7 @@ def run_keepalive(core: EspressoCore):
     EspressoCore.log(f"  Interval: {core.interval} seconds")
     EspressoCore.log(f"Press Ctrl+C to stop")
 
+    deadline = time.monotonic()
     try:
         while True:
             try:
@@ -113,7 +135,7 @@ def run_keepalive(core: EspressoCore):
                     break
 
                 # Wait for next interval
-                time.sleep(core.interval)
+                deadline = wait_for_next_tick(deadline, core.interval)
 
             except KeyboardInterrupt:
                 raise
@@ -122,11 +144,13 @@ def run_keepalive(core: EspressoCore):
                 EspressoCore.log(f"Error in main loop: {e}")
                 if core.consecutive_errors >= core.max_errors:
                     raise
-                time.sleep(core.interval)
+                deadline = wait_for_next_tick(deadline, core.interval)
 
     except KeyboardInterrupt:
         EspressoCore.log(f"\nStopping Espresso (Ctrl+C pressed)")
         sys.exit(0)
+    finally:
+        core.close()
 
 
 def main():
@@ -1,10 +1,264 @@
 """
 Core functionality for espresso operations
 """
+import hashlib
+import os
+import pty
+import select
 import subprocess
+import threading
+import time
 from datetime import datetime
+from pathlib import Path
 from typing import Optional, Callable
 
+# Native window/key APIs; AppleScript is used when PyObjC is not installed
+try:
+    from AppKit import NSRunningApplication, NSApplicationActivateIgnoringOtherApps
+    from Quartz import (
+        CGEventCreateKeyboardEvent, CGEventPost, CGWindowListCopyWindowInfo,
+        kCGHIDEventTap, kCGNullWindowID, kCGWindowListOptionAll,
+        kCGWindowListOptionOnScreenOnly, kCGWindowListExcludeDesktopElements,
+    )
+    PYOBJC_AVAILABLE = True
+except ImportError:
+    PYOBJC_AVAILABLE = False
+
+# Control key
+KEEPALIVE_KEY_CODE = 59
+
+# Directory for AppleScripts compiled once with osacompile
+COMPILED_SCRIPT_DIR = Path.home() / ".espresso" / "compiled"
+
+# The scripts take the app name as their first argument, so they can be
+# compiled once and reused for every keepalive tick
+IS_APP_RUNNING_SCRIPT = '''
+on run argv
+    set appName to item 1 of argv
+    tell application "System Events"
+        set appRunning to exists (process appName)
+        if appRunning then
+            try
+                set winCount to count of windows of process appName
+                return winCount > 0
+            on error
+                return false
+            end try
+        else
+            return false
+        end if
+    end tell
+end run
+'''
+
+SEND_KEY_WITH_FOCUS_SCRIPT = '''
+on run argv
+    set appName to item 1 of argv
+    tell application "System Events"
+        -- Remember current frontmost app
+        set currentApp to name of first application process whose frontmost is true
+
+        -- Focus Citrix Viewer
+        tell process appName
+            set frontmost to true
+        end tell
+
+        -- Wait briefly for focus
+        delay 0.2
+
+        -- Send Control key (key code 59)
+        key code 59
+
+        -- Wait briefly
+        delay 0.1
+
+        -- Return to previous app
+        tell process currentApp
+            set frontmost to true
+        end tell
+    end tell
+    return true
+end run
+'''
+
+
+def compile_applescript(name: str, source: str) -> Optional[Path]:
+    """
+    Compile an AppleScript once and return the path of the compiled script
+
+    Compiled scripts are cached by content hash, so they are only rebuilt
+    when the source changes.
+
+    Args:
+        name: Base name for the compiled script file
+        source: AppleScript source
+
+    Returns:
+        Path to the compiled .scpt file, or None if osacompile is
+        unavailable or fails
+    """
+    digest = hashlib.sha1(source.encode()).hexdigest()[:12]
+    path = COMPILED_SCRIPT_DIR / f"{name}-{digest}.scpt"
+
+    if not path.exists():
+        try:
+            COMPILED_SCRIPT_DIR.mkdir(parents=True, exist_ok=True)
+            result = subprocess.run(['osacompile', '-o', str(path), '-e', source],
+                                    capture_output=True, text=True, timeout=10)
+            if result.returncode != 0:
+                return None
+        except Exception:
+            return None
+
+    return path
+
+
+def _applescript_string(value: str) -> str:
+    """Quote a Python string as an AppleScript string literal"""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+class OsascriptSession:
+    """
+    Long-lived interactive osascript process for running compiled scripts
+
+    Avoids spawning a new osascript process for every call. Each call
+    writes a 'run script' statement followed by a sentinel string to the
+    interpreter's stdin and reads its output up to the sentinel.
+
+    The interpreter's output goes to a pseudo-terminal rather than a pipe,
+    since stdio only flushes each line when writing to a terminal. If a
+    call still times out, the session disables itself and run() returns
+    None from then on, so callers fall back to one-shot processes instead
+    of waiting out the timeout on every call.
+    """
+
+    SENTINEL = "__ESPRESSO_END__"
+
+    def __init__(self):
+        self._proc = None
+        self._output_fd = None
+        self._disabled = False
+        self._lock = threading.Lock()
+
+    def run(self, script_path: str, *args: str, timeout: float = 5.0) -> Optional[str]:
+        """
+        Run a compiled script in the session
+
+        Args:
+            script_path: Path to compiled .scpt file
+            *args: Arguments passed to the script's run handler
+            timeout: Seconds to wait for the result
+
+        Returns:
+            Result of the script as text, or None if the session failed
+        """
+        params = ", ".join(_applescript_string(arg) for arg in args)
+        statement = (
+            f"run script (POSIX file {_applescript_string(script_path)}) "
+            f"with parameters {{{params}}}\n"
+            f'"{self.SENTINEL}"\n'
+        )
+
+        with self._lock:
+            if self._disabled:
+                return None
+            try:
+                if self._proc is None or self._proc.poll() is not None:
+                    self._start()
+                self._proc.stdin.write(statement.encode())
+                self._proc.stdin.flush()
+                output = self._read_until_sentinel(timeout)
+            except TimeoutError:
+                self._disabled = True
+                self._kill()
+                return None
+            except Exception:
+                self._kill()
+                return None
+
+        # Output looks like "=> true\n=> \"__ESPRESSO_END__\"" - keep the
+        # last complete line before the sentinel and drop the result prefix
+        lines = output.splitlines()[:-1]
+        for line in reversed(lines):
+            line = line.lstrip('>= ').strip()
+            if line:
+                return line
+        return ""
+
+    def _start(self):
+        """Start the interpreter with its output on a pseudo-terminal"""
+        self._kill()
+        master_fd, slave_fd = pty.openpty()
+        try:
+            self._proc = subprocess.Popen(
+                ['osascript', '-i'],
+                stdin=subprocess.PIPE,
+                stdout=slave_fd,
+                stderr=slave_fd
+            )
+        except Exception:
+            os.close(master_fd)
+            raise
+        finally:
+            os.close(slave_fd)
+        self._output_fd = master_fd
+
+    def _read_until_sentinel(self, timeout: float) -> str:
+        """Read interpreter output until the sentinel appears"""
+        fd = self._output_fd
+        deadline = time.monotonic() + timeout
+        buffer = b""
+        sentinel = self.SENTINEL.encode()
+
+        while sentinel not in buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("osascript session timed out")
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+            try:
+                chunk = os.read(fd, 4096)
+            except OSError:
+                # The pty reports EIO once the interpreter has exited
+                chunk = b""
+            if not chunk:
+                raise EOFError("osascript session exited")
+            buffer += chunk
+
+        return buffer.split(sentinel, 1)[0].decode(errors='replace')
+
+    def _close_output(self):
+        """Close our end of the interpreter's pseudo-terminal"""
+        if self._output_fd is not None:
+            os.close(self._output_fd)
+            self._output_fd = None
+
+    def _kill(self):
+        """Terminate a broken session; the next call starts a new one"""
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+                self._proc.wait(timeout=1)
+            except Exception:
+                pass
+            self._proc = None
+        self._close_output()
+
+    def close(self):
+        """Send EOF to the interpreter and wait for it to exit"""
+        with self._lock:
+            if self._proc is None:
+                return
+            try:
+                self._proc.stdin.close()
+                self._proc.wait(timeout=2)
+                self._proc = None
+                self._close_output()
+            except Exception:
+                self._kill()
+
 
 class EspressoCore:
     """Core espresso functionality shared between CLI and GUI"""
@@ -22,28 +276,75 @@ class EspressoCore:
         self.consecutive_errors = 0
         self.max_errors = 5
 
+        # Shared interpreter for the AppleScript fallback
+        self._session = OsascriptSession()
+
+        # Compile AppleScripts once instead of on every call
+        if not PYOBJC_AVAILABLE:
+            self._is_running_compiled = compile_applescript("is_app_running", IS_APP_RUNNING_SCRIPT)
+            self._send_key_compiled = compile_applescript("send_key_with_focus", SEND_KEY_WITH_FOCUS_SCRIPT)
+
+    def _run_script(self, source: str, compiled: Optional[Path]) -> Optional[str]:
+        """
+        Run an AppleScript with the app name as argument
+
+        A compiled script runs in the long-lived osascript session; if the
+        session fails, it runs in a one-shot osascript process instead.
+        Without a compiled script, the source is passed to osascript -e.
+
+        Args:
+            source: AppleScript source
+            compiled: Path to the compiled script, or None if compilation failed
+
+        Returns:
+            Script output, or None if the script failed
+        """
+        if compiled is not None:
+            output = self._session.run(str(compiled), self.app_name)
+            if output is not None:
+                return output
+            cmd = ['osascript', str(compiled)]
+        else:
+            cmd = ['osascript', '-e', source]
+
+        result = subprocess.run(cmd + [self.app_name],
+                                capture_output=True, text=True, timeout=5)
+        if result.returncode != 0:
+            return None
+        return result.stdout.strip()
+
+    def close(self):
+        """Shut down the osascript session"""
+        self._session.close()
+
+    def _target_pid(self) -> Optional[int]:
+        """PID of the target app if it owns a normal window, else None"""
+        windows = CGWindowListCopyWindowInfo(kCGWindowListOptionAll, kCGNullWindowID)
+        for window in windows or []:
+            if (window.get('kCGWindowLayer', 0) == 0 and
+                    window.get('kCGWindowOwnerName') == self.app_name):
+                return window.get('kCGWindowOwnerPID')
+        return None
+
+    @staticmethod
+    def _frontmost_pid() -> Optional[int]:
+        """PID of the app owning the frontmost normal window"""
+        windows = CGWindowListCopyWindowInfo(
+            kCGWindowListOptionOnScreenOnly | kCGWindowListExcludeDesktopElements,
+            kCGNullWindowID
+        )
+        # The list is ordered front to back
+        for window in windows or []:
+            if window.get('kCGWindowLayer', 0) == 0:
+                return window.get('kCGWindowOwnerPID')
+        return None
+
     def is_app_running(self) -> bool:
         """Check if target app is running and has windows"""
-        script = f'''
-        tell application "System Events"
-            set appRunning to exists (process "{self.app_name}")
-            if appRunning then
-                try
-                    set winCount to count of windows of process "{self.app_name}"
-                    return winCount > 0
-                on error
-                    return false
-                end try
-            else
-                return false
-            end if
-        end tell
-        '''
-
         try:
-            result = subprocess.run(['osascript', '-e', script],
-                                  capture_output=True, text=True, timeout=5)
-            return result.stdout.strip() == "true"
+            if PYOBJC_AVAILABLE:
+                return self._target_pid() is not None
+            return self._run_script(IS_APP_RUNNING_SCRIPT, self._is_running_compiled) == "true"
         except Exception:
             return False
 
@@ -60,38 +361,43 @@ class EspressoCore:
     def _send_key_with_focus(self) -> bool:
         """Focus Citrix window, send key, return to previous app"""
         try:
-            script = f'''
-            tell application "System Events"
-                -- Remember current frontmost app
-                set currentApp to name of first application process whose frontmost is true
-
-                -- Focus Citrix Viewer
-                tell process "{self.app_name}"
-                    set frontmost to true
-                end tell
-
-                -- Wait briefly for focus
-                delay 0.2
-
-                -- Send Control key (key code 59)
-                key code 59
-
-                -- Wait briefly
-                delay 0.1
-
-                -- Return to previous app
-                tell process currentApp
-                    set frontmost to true
-                end tell
-            end tell
-            '''
-
-            result = subprocess.run(['osascript', '-e', script],
-                                   capture_output=True, text=True, timeout=5)
-            return result.returncode == 0
+            if PYOBJC_AVAILABLE:
+                return self._send_key_native()
+            return self._run_script(SEND_KEY_WITH_FOCUS_SCRIPT, self._send_key_compiled) == "true"
         except Exception:
             return False
 
+    def _send_key_native(self) -> bool:
+        """In-process variant of the focus/key/restore AppleScript"""
+        pid = self._target_pid()
+        if pid is None:
+            return False
+
+        target = NSRunningApplication.runningApplicationWithProcessIdentifier_(pid)
+        if target is None:
+            return False
+
+        # Remember current frontmost app
+        previous_pid = self._frontmost_pid()
+
+        # Focus target app and wait briefly for focus
+        target.activateWithOptions_(NSApplicationActivateIgnoringOtherApps)
+        time.sleep(0.2)
+
+        # Send Control key down and up
+        for key_down in (True, False):
+            event = CGEventCreateKeyboardEvent(None, KEEPALIVE_KEY_CODE, key_down)
+            CGEventPost(kCGHIDEventTap, event)
+        time.sleep(0.1)
+
+        # Return to previous app
+        if previous_pid is not None and previous_pid != pid:
+            previous = NSRunningApplication.runningApplicationWithProcessIdentifier_(previous_pid)
+            if previous is not None:
+                previous.activateWithOptions_(NSApplicationActivateIgnoringOtherApps)
+
+        return True
+
     @staticmethod
     def log(message: str, callback: Optional[Callable[[str], None]] = None):
         """
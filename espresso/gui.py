@@ -2,27 +2,30 @@
 GUI version of espresso with menu bar icon
 """
 import argparse
+import atexit
+import functools
+import importlib.util
 import json
-import subprocess
 import sys
 import threading
 import time
 import os
 import logging
-from datetime import datetime
+import logging.handlers
+import queue
 from pathlib import Path
+from typing import Optional
+
+# GUI log file
+LOG_FILE = os.path.join(os.path.expanduser("~"), ".espresso", "gui.log")
 
-# Setup logging (level will be configured in main())
-logging.basicConfig(
-    level=logging.INFO,  # Default level
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.expanduser('~/.espresso/gui.log')),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 try:
     import rumps
 except ImportError:
@@ -30,38 +33,104 @@ except ImportError:
     print("Install it with: pip3 install rumps")
     sys.exit(1)
 
-from .core import EspressoCore
-
-# Optional audio monitoring
+# AppKit ships with PyObjC, which rumps depends on
 try:
-    from .audio_monitor import AudioMonitor
-    AUDIO_AVAILABLE = True
+    from AppKit import NSWorkspace
+    APPKIT_AVAILABLE = True
 except ImportError:
-    AUDIO_AVAILABLE = False
+    APPKIT_AVAILABLE = False
 
-# Optional screen monitoring
+# Fallback for the frontmost app check when the NSWorkspace lookup fails
 try:
-    from .screen_monitor import ScreenMonitor
-    SCREEN_AVAILABLE = True
+    from Foundation import NSAppleScript
+    NSAPPLESCRIPT_AVAILABLE = True
 except ImportError:
-    SCREEN_AVAILABLE = False
+    NSAPPLESCRIPT_AVAILABLE = False
 
+FRONTMOST_APP_SCRIPT = '''
+tell application "System Events"
+    set frontApp to name of first application process whose frontmost is true
+end tell
+return frontApp
+'''
 
+from .core import EspressoCore
+
+# Longest wait between checks while the target app is not running (seconds)
+MAX_ABSENT_INTERVAL = 600
+
+# Seconds between menu refreshes from pending status updates
+UI_REFRESH_INTERVAL = 0.5
+
+# Seconds during which an identical screen notification is not repeated
+NOTIFICATION_DEBOUNCE = 5.0
+
+
+def _hms_now(timestamp: Optional[float] = None) -> str:
+    """Local time as HH:MM:SS (now unless a timestamp is given)"""
+    t = time.localtime(timestamp)
+    return f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+
+
+def _set_menu_title(item, title: str):
+    """Set a menu item title, via set_title() where the item provides it"""
+    set_title = getattr(item, 'set_title', None)
+    if set_title is not None:
+        set_title(title)
+    else:
+        item.title = title
+
+
+def _modules_available(*names: str) -> bool:
+    """Check that top-level modules can be found, without importing them"""
+    try:
+        return all(importlib.util.find_spec(name) is not None for name in names)
+    except (ImportError, ValueError):
+        return False
+
+
+def _configure_logging(debug: bool = False, log_file: bool = True):
+    """Log to stdout, and to ~/.espresso/gui.log unless disabled, from a background thread"""
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
+        handlers.append(logging.FileHandler(LOG_FILE))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    # Callers only enqueue records; the listener thread does the writing
+    log_queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
+
+    # The listener's handlers format records; the queue handler only merges
+    # the message arguments (and any traceback) into the message
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(
+        level=logging.DEBUG if debug else logging.INFO,
+        handlers=[queue_handler]
+    )
+
+
+@functools.lru_cache(maxsize=1)
 def get_icon_path():
     """Get path to icon file"""
     # Try different locations
     possible_paths = [
         # Installed package
-        Path(__file__).parent.parent / "icons" / "icon-22.png",
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), "icons", "icon-22.png"),
         # Development
-        Path.cwd() / "icons" / "icon-22.png",
+        os.path.join(os.getcwd(), "icons", "icon-22.png"),
         # Fallback
-        Path.home() / "git" / "citrix-keepalive" / "icons" / "icon-22.png",
+        os.path.join(os.path.expanduser("~"), "git", "citrix-keepalive", "icons", "icon-22.png"),
     ]
 
     for path in possible_paths:
-        if path.exists():
-            return str(path)
+        if os.path.exists(path):
+            return path
 
     return None
 
@@ -80,11 +149,11 @@ class EspressoApp(rumps.App):
         screen_config=None
     ):
         # Get icon path
-        icon_path = get_icon_path()
+        self.icon_path = get_icon_path()
 
         super(EspressoApp, self).__init__(
             "Espresso",
-            icon=icon_path,
+            icon=self.icon_path,
             quit_button=None,
             template=True  # Use template mode for proper macOS dark mode support
         )
@@ -92,55 +161,47 @@ class EspressoApp(rumps.App):
         # Create core
         self.core = EspressoCore(app_name=app_name, interval=interval)
 
-        # State
-        self.running = False
+        # State (the stop event is set while keepalive is not running)
+        self._stop_event = threading.Event()
+        self._stop_event.set()
         self.keepalive_thread = None
+        self._absent_streak = 0
         self.last_action_time = None
         self.last_status = "Idle"
 
+        # Menu updates from worker threads, applied on the main thread
+        self._ui_lock = threading.Lock()
+        self._pending_status: Optional[str] = None
+        self._pending_action_ts: Optional[float] = None
+        self._ui_timer = rumps.Timer(self._drain_ui, UI_REFRESH_INTERVAL)
+        self._ui_timer.start()
+
+        # Audio and screen monitoring pull in heavy dependencies (and compile
+        # their kernels on import), so the monitors are only created when
+        # first enabled. Until then, just check the dependencies are there.
+        self.audio_available = _modules_available('numpy', 'sounddevice')
+        self.screen_available = _modules_available('Quartz', 'PIL')
+
         # Audio monitoring
         self.audio_monitor = None
         self.audio_enabled = False
         self.audio_device = audio_device
-
-        if AUDIO_AVAILABLE:
-            try:
-                self.audio_monitor = AudioMonitor(
-                    device_name=audio_device,
-                    notification_threshold=notification_threshold,
-                    call_threshold=call_threshold,
-                    call_duration=call_duration
-                )
-                self.audio_monitor.set_notification_callback(self.on_audio_notification)
-                self.audio_monitor.set_call_callbacks(
-                    on_start=self.on_call_start,
-                    on_end=self.on_call_end
-                )
-            except Exception as e:
-                print(f"Audio monitoring not available: {e}")
-                self.audio_monitor = None
+        self._audio_settings = {
+            'notification_threshold': notification_threshold,
+            'call_threshold': call_threshold,
+            'call_duration': call_duration,
+        }
 
         # Screen monitoring
         self.screen_monitor = None
         self.screen_enabled = False
         self.screen_config = screen_config or {}
+        self._last_notify_key = None
+        self._last_notify_ts = 0.0
 
-        # Create screen monitor if available (independent of enabled flag)
-        # The 'enabled' flag is only used for autostart
-        if SCREEN_AVAILABLE and self.screen_config:
-            try:
-                self.screen_monitor = ScreenMonitor(
-                    window_name=app_name,
-                    scan_interval=self.screen_config.get('scan_interval', 2.0),
-                    detection_method=self.screen_config.get('detection_method', 'color'),
-                    notification_color=self.screen_config.get('teams_notification_color', '#464775'),
-                    color_tolerance=self.screen_config.get('color_tolerance', 30),
-                    min_pixels=self.screen_config.get('min_pixels', 1000),
-                    debug_screenshots=self.screen_config.get('debug_screenshots', False)
-                )
-            except Exception as e:
-                print(f"Screen monitoring not available: {e}")
-                self.screen_monitor = None
+        # Frontmost app script, compiled on first use by the fallback check
+        self._front_script = None
+        self._front_script_lock = threading.Lock()
 
         # Create menu items (keep references for updates)
         self.status_item = rumps.MenuItem("Status: Stopped", callback=None)
@@ -149,42 +210,35 @@ class EspressoApp(rumps.App):
         self.audio_item = None
         self.screen_item = None
 
-        # Build menu
-        menu_items = [
-            rumps.MenuItem(f"Target: {self.core.app_name}", callback=None),
-            rumps.MenuItem(f"Interval: {self.core.interval}s", callback=None),
-            rumps.separator,
-            self.keepalive_item,
-            rumps.separator,
-            self.status_item,
-            self.last_action_item,
-        ]
-
-        # Add audio monitoring menu items if available
-        if self.audio_monitor:
+        if self.audio_available:
             self.audio_item = rumps.MenuItem("▶ Enable Audio Monitor", callback=self.toggle_audio_monitoring)
-            menu_items.extend([
-                rumps.separator,
-                self.audio_item,
-            ])
-
-        # Add screen monitoring menu items if available
-        if self.screen_monitor:
+        # The screen monitor needs a screen_monitoring config section; its
+        # 'enabled' flag is only used for autostart
+        if self.screen_available and self.screen_config:
             self.screen_item = rumps.MenuItem("▶ Enable Screen Monitor", callback=self.toggle_screen_monitoring)
-            menu_items.extend([
-                rumps.separator,
-                self.screen_item,
-            ])
 
-        menu_items.extend([
-            rumps.separator,
-            rumps.MenuItem("Quit", callback=rumps.quit_application)
-        ])
+        # Build menu, with audio and screen items only if available
+        menu_items = (
+            (
+                rumps.MenuItem(f"Target: {app_name}", callback=None),
+                rumps.MenuItem(f"Interval: {interval}s", callback=None),
+                rumps.separator,
+                self.keepalive_item,
+                rumps.separator,
+                self.status_item,
+                self.last_action_item,
+            )
+            + ((rumps.separator, self.audio_item) if self.audio_item is not None else ())
+            + ((rumps.separator, self.screen_item) if self.screen_item is not None else ())
+            + (rumps.separator, rumps.MenuItem("Quit", callback=rumps.quit_application))
+        )
 
         self.menu = menu_items
 
-        # Store original icon
-        self.icon_path = icon_path
+    @property
+    def running(self) -> bool:
+        """Whether the keepalive loop is active"""
+        return not self._stop_event.is_set()
 
     def update_icon(self, status):
         """Update menu bar icon - for now just keep the espresso icon"""
@@ -193,21 +247,36 @@ class EspressoApp(rumps.App):
         pass
 
     def update_status(self, status):
-        """Update status menu item"""
+        """Update status menu item (applied on the main thread by _drain_ui)"""
         self.last_status = status
-        self.status_item.title = f"Status: {status}"
+        with self._ui_lock:
+            self._pending_status = status
 
     def update_last_action(self):
-        """Update last action time"""
-        self.last_action_time = datetime.now()
-        time_str = self.last_action_time.strftime("%H:%M:%S")
-        self.last_action_item.title = f"Last action: {time_str}"
+        """Update last action time (applied on the main thread by _drain_ui)"""
+        self.last_action_time = time.time()
+        with self._ui_lock:
+            self._pending_action_ts = self.last_action_time
+
+    def _drain_ui(self, _):
+        """Copy pending status updates into the menu items"""
+        with self._ui_lock:
+            status, self._pending_status = self._pending_status, None
+            action_ts, self._pending_action_ts = self._pending_action_ts, None
+
+        if status is not None:
+            self.status_item.title = f"Status: {status}"
+        if action_ts is not None:
+            self.last_action_item.title = f"Last action: {_hms_now(action_ts)}"
 
     def keepalive_loop(self):
         """Main keepalive loop running in background thread"""
-        while self.running:
+        self._absent_streak = 0
+        while not self._stop_event.is_set():
             try:
+                sleep_for = self.core.interval
                 if self.core.is_app_running():
+                    self._absent_streak = 0
                     self.update_icon("🟢")
                     self.update_status(f"{self.core.app_name} active")
 
@@ -223,23 +292,33 @@ class EspressoApp(rumps.App):
                     if self.core.consecutive_errors >= self.core.max_errors:
                         self.update_status("Too many errors - stopped")
                         self.update_icon("⚠️")
-                        self.running = False
+                        self._stop_event.set()
                         break
                 else:
                     self.update_icon("🟡")
                     self.update_status(f"{self.core.app_name} not running")
                     self.core.consecutive_errors = 0
 
-                # Wait for next interval
-                time.sleep(self.core.interval)
+                    # Check less often while the app stays closed
+                    sleep_for = min(self.core.interval * 2 ** min(self._absent_streak, 4),
+                                    MAX_ABSENT_INTERVAL)
+                    self._absent_streak += 1
+
+                # Wait for next interval, waking up early on stop
+                if self._stop_event.wait(sleep_for):
+                    break
 
             except Exception as e:
                 self.core.consecutive_errors += 1
                 self.update_status(f"Error: {str(e)[:30]}")
                 if self.core.consecutive_errors >= self.core.max_errors:
-                    self.running = False
+                    self._stop_event.set()
                     break
-                time.sleep(self.core.interval)
+                if self._stop_event.wait(self.core.interval):
+                    break
+
+        # Release the osascript session until keepalive is started again
+        self.core.close()
 
         # Stopped
         if not self.running:
@@ -257,7 +336,7 @@ class EspressoApp(rumps.App):
     def start_keepalive(self):
         """Start keepalive monitoring"""
         if not self.running:
-            self.running = True
+            self._stop_event.clear()
             self.core.consecutive_errors = 0
             self.update_status("Starting...")
             self.update_icon("🟢")
@@ -267,7 +346,7 @@ class EspressoApp(rumps.App):
             self.keepalive_thread.start()
 
             # Update menu item
-            self.keepalive_item.title = "⏸ Stop Keepalive"
+            _set_menu_title(self.keepalive_item, "⏸ Stop Keepalive")
 
             rumps.notification(
                 "Espresso Started",
@@ -278,12 +357,12 @@ class EspressoApp(rumps.App):
     def stop_keepalive(self):
         """Stop keepalive monitoring"""
         if self.running:
-            self.running = False
+            self._stop_event.set()
             self.update_status("Stopped")
             self.update_icon("⏸")
 
             # Update menu item
-            self.keepalive_item.title = "▶ Start Keepalive"
+            _set_menu_title(self.keepalive_item, "▶ Start Keepalive")
 
             rumps.notification(
                 "Espresso Stopped",
@@ -291,17 +370,68 @@ class EspressoApp(rumps.App):
                 ""
             )
 
+    def _ensure_audio_monitor(self) -> bool:
+        """Create the audio monitor on first use, return whether it exists"""
+        if self.audio_monitor is not None:
+            return True
+        if not self.audio_available:
+            return False
+
+        try:
+            from .audio_monitor import AudioMonitor
+            monitor = AudioMonitor(device_name=self.audio_device, **self._audio_settings)
+        except Exception as e:
+            logger.error("Audio monitoring not available: %s", e)
+            return False
+
+        monitor.set_notification_callback(self.on_audio_notification)
+        monitor.set_call_callbacks(
+            on_start=self.on_call_start,
+            on_end=self.on_call_end
+        )
+        self.audio_monitor = monitor
+        return True
+
+    def _ensure_screen_monitor(self) -> bool:
+        """Create the screen monitor on first use, return whether it exists"""
+        if self.screen_monitor is not None:
+            return True
+        if not self.screen_available:
+            return False
+
+        try:
+            from .screen_monitor import ScreenMonitor
+            self.screen_monitor = ScreenMonitor(
+                window_name=self.core.app_name,
+                scan_interval=self.screen_config.get('scan_interval', 2.0),
+                detection_method=self.screen_config.get('detection_method', 'color'),
+                notification_color=self.screen_config.get('teams_notification_color', '#464775'),
+                color_tolerance=self.screen_config.get('color_tolerance', 30),
+                min_pixels=self.screen_config.get('min_pixels', 1000),
+                debug_screenshots=self.screen_config.get('debug_screenshots', False)
+            )
+        except (Exception, SystemExit) as e:
+            # screen_monitor exits on import when Quartz or Pillow is missing
+            logger.error("Screen monitoring not available: %s", e)
+            return False
+        return True
+
     def toggle_audio_monitoring(self, sender):
         """Toggle audio monitoring on/off"""
-        if not self.audio_monitor:
+        if not self._ensure_audio_monitor():
+            rumps.notification(
+                "Audio Monitor Error",
+                "Audio monitoring not available",
+                ""
+            )
             return
 
         if self.audio_enabled:
             # Disable audio monitoring
             self.audio_monitor.stop()
             self.audio_enabled = False
-            if self.audio_item:
-                self.audio_item.title = "▶ Enable Audio Monitor"
+            if self.audio_item is not None:
+                _set_menu_title(self.audio_item, "▶ Enable Audio Monitor")
 
             rumps.notification(
                 "Audio Monitor Disabled",
@@ -313,8 +443,8 @@ class EspressoApp(rumps.App):
             try:
                 self.audio_monitor.start()
                 self.audio_enabled = True
-                if self.audio_item:
-                    self.audio_item.title = "⏸ Disable Audio Monitor"
+                if self.audio_item is not None:
+                    _set_menu_title(self.audio_item, "⏸ Disable Audio Monitor")
 
                 rumps.notification(
                     "Audio Monitor Enabled",
@@ -328,22 +458,40 @@ class EspressoApp(rumps.App):
                     ""
                 )
 
+    def _frontmost_app_via_applescript(self) -> Optional[str]:
+        """Name of the frontmost app via System Events, or None on failure"""
+        if not NSAPPLESCRIPT_AVAILABLE:
+            return None
+
+        try:
+            # NSAppleScript instances are not thread-safe
+            with self._front_script_lock:
+                if self._front_script is None:
+                    self._front_script = NSAppleScript.alloc().initWithSource_(FRONTMOST_APP_SCRIPT)
+                    self._front_script.compileAndReturnError_(None)
+                result, error = self._front_script.executeAndReturnError_(None)
+        except Exception as e:
+            logger.debug("AppleScript frontmost app lookup failed: %s", e)
+            return None
+
+        if result is None:
+            logger.debug("AppleScript frontmost app lookup failed: %s", error)
+            return None
+        return result.stringValue()
+
     def is_app_in_foreground(self) -> bool:
         """Check if target app is in foreground (frontmost)"""
-        script = f'''
-        tell application "System Events"
-            set frontApp to name of first application process whose frontmost is true
-        end tell
-        return frontApp
-        '''
+        if APPKIT_AVAILABLE:
+            try:
+                app = NSWorkspace.sharedWorkspace().frontmostApplication()
+                if app is not None:
+                    return app.localizedName() == self.core.app_name
+                logger.debug("NSWorkspace reported no frontmost app")
+            except Exception as e:
+                logger.debug("NSWorkspace frontmost app lookup failed: %s", e)
 
-        try:
-            result = subprocess.run(['osascript', '-e', script],
-                                  capture_output=True, text=True, timeout=2)
-            frontmost_app = result.stdout.strip()
-            return frontmost_app == self.core.app_name
-        except Exception:
-            return False
+        # Ask System Events when NSWorkspace is unavailable or gave no answer
+        return self._frontmost_app_via_applescript() == self.core.app_name
 
     def on_audio_notification(self, level):
         """Callback for audio notification detection"""
@@ -384,10 +532,14 @@ class EspressoApp(rumps.App):
 
     def toggle_screen_monitoring(self, sender):
         """Toggle screen monitoring on/off"""
-        logger.debug(f"toggle_screen_monitoring called (current state: enabled={self.screen_enabled})")
+        logger.debug("toggle_screen_monitoring called (current state: enabled=%s)", self.screen_enabled)
 
-        if not self.screen_monitor:
-            logger.error("No screen monitor available!")
+        if not self._ensure_screen_monitor():
+            rumps.notification(
+                "Screen Monitor Error",
+                "Screen monitoring not available",
+                ""
+            )
             return
 
         if self.screen_enabled:
@@ -395,11 +547,8 @@ class EspressoApp(rumps.App):
             logger.info("Disabling screen monitor...")
             self.screen_monitor.stop()
             self.screen_enabled = False
-            if self.screen_item:
-                try:
-                    self.screen_item.set_title("▶ Enable Screen Monitor")
-                except:
-                    self.screen_item.title = "▶ Enable Screen Monitor"
+            if self.screen_item is not None:
+                _set_menu_title(self.screen_item, "▶ Enable Screen Monitor")
 
             rumps.notification(
                 "Screen Monitor Disabled",
@@ -409,26 +558,23 @@ class EspressoApp(rumps.App):
         else:
             # Enable screen monitoring
             logger.info("Enabling screen monitor...")
-            logger.debug(f"screen_monitor object: {self.screen_monitor}")
-            logger.debug(f"screen_item object: {self.screen_item}")
+            logger.debug("screen_monitor object: %s", self.screen_monitor)
+            logger.debug("screen_item object: %s", self.screen_item)
             try:
                 # Start in background thread
-                logger.debug(f"Creating thread with callback: {self.on_screen_notification}")
+                logger.debug("Creating thread with callback: %s", self.on_screen_notification)
                 screen_thread = threading.Thread(
                     target=self.screen_monitor.start,
                     args=(self.on_screen_notification,),
                     daemon=True
                 )
                 screen_thread.start()
-                logger.debug(f"Thread started: {screen_thread}")
+                logger.debug("Thread started: %s", screen_thread)
 
                 self.screen_enabled = True
 
-                if self.screen_item:
-                    try:
-                        self.screen_item.set_title("⏸ Disable Screen Monitor")
-                    except:
-                        self.screen_item.title = "⏸ Disable Screen Monitor"
+                if self.screen_item is not None:
+                    _set_menu_title(self.screen_item, "⏸ Disable Screen Monitor")
 
                 rumps.notification(
                     "Screen Monitor Enabled",
@@ -436,7 +582,7 @@ class EspressoApp(rumps.App):
                     f"Scanning every {self.screen_monitor.scan_interval}s"
                 )
             except Exception as e:
-                logger.error(f"Error starting screen monitor: {e}", exc_info=True)
+                logger.error("Error starting screen monitor: %s", e, exc_info=True)
                 rumps.notification(
                     "Screen Monitor Error",
                     f"Failed to start: {str(e)[:50]}",
@@ -445,20 +591,29 @@ class EspressoApp(rumps.App):
 
     def on_screen_notification(self, source: str, details: dict):
         """Callback for screen notification detection"""
-        logger.info(f"on_screen_notification called: source={source}, details={details}")
+        logger.info("on_screen_notification called: source=%s, details=%s", source, details)
+
+        # Skip repeats of the same notification (e.g. while a banner animates)
+        key = (source, details.get('notification_text', ''))
+        now = time.monotonic()
+        if key == self._last_notify_key and now - self._last_notify_ts < NOTIFICATION_DEBOUNCE:
+            logger.debug("Skipping duplicate notification: %s", key)
+            return
+        self._last_notify_key = key
+        self._last_notify_ts = now
 
         # Only notify if app is NOT in foreground
         in_foreground = self.is_app_in_foreground()
-        logger.info(f"is_app_in_foreground: {in_foreground}")
+        logger.info("is_app_in_foreground: %s", in_foreground)
 
         if in_foreground:
-            logger.info(f"Skipping notification - {self.core.app_name} is in foreground")
+            logger.info("Skipping notification - %s is in foreground", self.core.app_name)
             return  # User is already looking at the app, no need to notify
 
         logger.info("Sending macOS notification...")
 
         # Use longer notification text to keep it visible longer
-        timestamp = datetime.now().strftime('%H:%M:%S')
+        timestamp = _hms_now()
 
         # Get notification text from OCR if available
         notification_text = details.get('notification_text', '')
@@ -466,7 +621,7 @@ class EspressoApp(rumps.App):
         if notification_text:
             # Show OCR text in notification
             message = f"💬 {notification_text}\n\n⏰ Detected at {timestamp}"
-            logger.info(f"Notification with OCR text: {notification_text}")
+            logger.info("Notification with OCR text: %s", notification_text)
         else:
             # Fallback message without OCR
             message = f"A Teams chat notification appeared at {timestamp}. Click to switch to Citrix Viewer."
@@ -477,7 +632,26 @@ class EspressoApp(rumps.App):
             message=message,
             sound=True
         )
-        logger.info(f"Notification sent at {timestamp}")
+        logger.info("Notification sent at %s", timestamp)
+
+
+# Parsed config files by path, as (st_mtime_ns, config)
+_config_cache = {}
+
+
+def _read_config(path) -> dict:
+    """Parse a JSON config file, reusing the last result while it is unchanged"""
+    path = str(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _config_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    config = orjson.loads(data) if orjson is not None else json.loads(data)
+    _config_cache[path] = (mtime, config)
+    return config
 
 
 def load_config(config_file: str = None) -> dict:
@@ -485,8 +659,7 @@ def load_config(config_file: str = None) -> dict:
     # Try user-specified config first
     if config_file:
         try:
-            with open(config_file, 'r') as f:
-                return json.load(f)
+            return _read_config(config_file)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"Warning: Could not load config from {config_file}: {e}")
             return {}
@@ -495,8 +668,7 @@ def load_config(config_file: str = None) -> dict:
     default_config = Path.home() / ".espresso" / "config.json"
     if default_config.exists():
         try:
-            with open(default_config, 'r') as f:
-                return json.load(f)
+            return _read_config(default_config)
         except json.JSONDecodeError as e:
             print(f"Warning: Could not parse {default_config}: {e}")
 
@@ -559,11 +731,17 @@ def main():
         help='Enable debug logging'
     )
 
+    parser.add_argument(
+        '--no-log-file',
+        action='store_true',
+        help='Log to stdout only, not to ~/.espresso/gui.log (e.g. under launchd)'
+    )
+
     args = parser.parse_args()
 
-    # Configure logging level
+    # Configure logging
+    _configure_logging(debug=args.debug, log_file=not args.no_log_file)
     if args.debug:
-        logging.getLogger().setLevel(logging.DEBUG)
         logger.info("Debug logging enabled")
 
     # Load config (from --config arg or default ~/.espresso/config.json)
@@ -602,48 +780,43 @@ def main():
 
     # Autostart audio monitoring if requested
     if autostart_audio:
-        logger.info(f"Autostart audio requested, audio_monitor available: {app.audio_monitor is not None}")
-        if app.audio_monitor is not None and app.audio_item is not None:
+        logger.info("Autostart audio requested, audio monitoring available: %s", app.audio_item is not None)
+        if app.audio_item is not None:
             logger.info("Starting audio monitor via autostart...")
             app.toggle_audio_monitoring(app.audio_item)
-        elif app.audio_monitor is None:
-            logger.warning("Audio monitor not available")
         else:
-            logger.warning("Audio menu item not created")
+            logger.warning("Audio monitor not available")
 
     # Autostart screen monitoring if requested
     if autostart_screen:
-        logger.debug(f"Autostart screen requested, screen_monitor available: {app.screen_monitor is not None}")
-        if app.screen_monitor is not None and app.screen_item is not None:
+        logger.debug("Autostart screen requested, screen monitoring available: %s", app.screen_item is not None)
+        if app.screen_item is not None:
             logger.info("Autostarting screen monitor...")
             app.toggle_screen_monitoring(app.screen_item)
-        elif app.screen_monitor is None:
-            logger.warning("Screen monitor not available for autostart")
         else:
-            logger.warning("Screen menu item not created")
+            logger.warning("Screen monitor not available for autostart")
 
-    # Update menu items after a short delay to ensure rumps is ready
-    def update_menu_titles():
+    # Update menu items once rumps is running
+    def update_menu_titles(timer):
         """Update menu item titles to reflect autostart state"""
+        timer.stop()
         logger.debug("Updating menu item titles after autostart...")
 
         if app.screen_enabled and app.screen_item is not None:
-            app.screen_item.title = "⏸ Disable Screen Monitor"
+            _set_menu_title(app.screen_item, "⏸ Disable Screen Monitor")
             logger.debug("Set screen monitor item to active state")
 
         if app.audio_enabled and app.audio_item is not None:
-            app.audio_item.title = "⏸ Disable Audio Monitor"
+            _set_menu_title(app.audio_item, "⏸ Disable Audio Monitor")
             logger.debug("Set audio monitor item to active state")
 
         if app.running and app.keepalive_item is not None:
-            app.keepalive_item.title = "⏸ Stop Keepalive"
+            _set_menu_title(app.keepalive_item, "⏸ Stop Keepalive")
             logger.debug("Set keepalive item to active state")
 
-    # Schedule menu update using threading.Timer (to sync menu state with autostart)
-    import threading
-    timer = threading.Timer(0.5, update_menu_titles)
-    timer.daemon = True
-    timer.start()
+    # Fire once on the first run loop tick (to sync menu state with autostart)
+    menu_timer = rumps.Timer(update_menu_titles, 0.01)
+    menu_timer.start()
 
     app.run()
 
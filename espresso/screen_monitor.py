@@ -5,8 +5,12 @@ Screen monitoring for visual notification detection.
 Monitors a specific window (e.g., Citrix Viewer) for visual changes
 that indicate notifications, such as Teams notification popups.
 """
+import hashlib
+import re
 import sys
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import logging
 from datetime import datetime
 from typing import Optional, Callable, Dict, Any
@@ -16,6 +20,7 @@ try:
     from Quartz import CGWindowListCopyWindowInfo, CGWindowListCreateImage
     from Quartz import kCGWindowListOptionAll, kCGNullWindowID
     from Quartz import kCGWindowListOptionIncludingWindow
+    from Quartz import kCGWindowListOptionOnScreenOnly, kCGWindowListExcludeDesktopElements
     from Quartz import kCGWindowImageBoundsIgnoreFraming, CGRectNull
 except ImportError:
     print("❌ Error: pyobjc-framework-Quartz not installed")
@@ -29,17 +34,64 @@ except ImportError:
     print("Install with: pip install Pillow")
     sys.exit(1)
 
+# NumPy is optional; without it regions are handled as PIL images and bytes
+try:
+    import numpy as np
+    from ._screen_kernels import count_matches
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 try:
     import Vision
-    from Foundation import NSURL
     OCR_AVAILABLE = True
 except ImportError:
     OCR_AVAILABLE = False
-    logger.warning("Vision framework not available - OCR disabled")
 
 
 logger = logging.getLogger(__name__)
 
+if not OCR_AVAILABLE:
+    logger.warning("Vision framework not available - OCR disabled")
+
+# Sampling step (in pixels, both directions) for color detection
+DETECTION_STRIDE = 4
+
+# Number of recent region hashes whose detection result is kept
+DETECTION_CACHE_SIZE = 32
+
+# Number of recent region hashes whose OCR text is kept
+OCR_CACHE_SIZE = 16
+
+# Idle backoff: the scan interval doubles per unchanged scan, up to
+# 2**IDLE_BACKOFF_STEPS times the base interval and never above
+# MAX_SCAN_INTERVAL seconds
+IDLE_BACKOFF_STEPS = 3
+MAX_SCAN_INTERVAL = 5.0
+
+# OCR lines containing any of these are UI elements, not notification text
+IGNORE_KEYWORDS = (
+    'Microsoft Teams',
+    'Schnelle Antwort senden',
+    'Online mit Microsoft Exchange',
+    'len',
+    'SL',
+    '100 %',
+    '+',
+)
+IGNORE_RE = re.compile('|'.join(re.escape(keyword) for keyword in IGNORE_KEYWORDS))
+
+# Dates such as "08.01.2026": digits, dots and spaces only, with at least
+# one dot and one digit
+DATE_RE = re.compile(r'(?=[^.]*\.)(?=\D*\d)[\d. ]+')
+
+
+def _image_size(image) -> tuple:
+    """Return (width, height) of a pixel array or PIL Image."""
+    if NUMPY_AVAILABLE:
+        return image.shape[1], image.shape[0]
+    return image.size
+
 
 class ScreenMonitor:
     """
@@ -67,7 +119,7 @@ class ScreenMonitor:
         Args:
             window_name: Name of the window to monitor (e.g., "Citrix Viewer")
             scan_interval: Seconds between scans (default: 2.0)
-            detection_method: Detection method ("color" or "diff")
+            detection_method: Detection method (only "color" is supported)
             notification_color: Hex color of notification background (e.g., "#464775")
             color_tolerance: RGB tolerance for color matching (0-255)
             min_pixels: Minimum pixels required to trigger detection
@@ -77,9 +129,21 @@ class ScreenMonitor:
         self.window_name = window_name
         self.scan_interval = scan_interval
         self.detection_method = detection_method
+        detectors = {"color": self._detect_color if NUMPY_AVAILABLE else self._detect_color_bytes}
+        if detection_method not in detectors:
+            raise ValueError(f"Unknown detection method: {detection_method}")
+        self._detect_fn = detectors[detection_method]
         self.notification_color = self._hex_to_rgb(notification_color)
+        self._target_bgr = self.notification_color[::-1]
         self.color_tolerance = color_tolerance
+        self._tol_sq = color_tolerance * color_tolerance
+        if NUMPY_AVAILABLE:
+            self._target_bgr_arr = np.array(self._target_bgr, dtype=np.int64)
+            # Per-channel box around the target, used to prefilter pixels
+            self._bbox_lo = np.clip(self._target_bgr_arr - color_tolerance, 0, 255).astype(np.uint8)
+            self._bbox_hi = np.clip(self._target_bgr_arr + color_tolerance, 0, 255).astype(np.uint8)
         self.min_pixels = min_pixels
+        self._min_samples = max(1, min_pixels // (DETECTION_STRIDE * DETECTION_STRIDE))
         self.region_size = region_size
         self.region_position = region_position
 
@@ -89,6 +153,15 @@ class ScreenMonitor:
         self.detection_cooldown = 10.0  # Don't re-trigger within 10 seconds
         self.debug_screenshots = debug_screenshots
         self.scan_count = 0
+        self._scale = None  # Image pixels per window point, set on first capture
+        self._cached_window_id = None
+        self._last_sample = None
+        self._spare_sample = None
+        self._idle_streak = 0  # Consecutive scans with an unchanged region
+        self._pending_detection = False  # Detected, but the callback has not fired yet
+        self._debug_executor = None  # Saves debug screenshots off the scan loop
+        self._detection_cache = OrderedDict()
+        self._ocr_cache = OrderedDict()
 
         logger.info(f"ScreenMonitor initialized: window='{window_name}', "
                    f"scan_interval={scan_interval}s, color={notification_color}, "
@@ -99,39 +172,66 @@ class ScreenMonitor:
         hex_color = hex_color.lstrip('#')
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
+    def _match_window(self, window) -> Optional[Dict[str, Any]]:
+        """
+        Build window info if a window matches window_name.
+
+        Args:
+            window: Window dict from CGWindowListCopyWindowInfo
+
+        Returns:
+            Dict with window info (id, name, owner, bounds) or None if no match
+        """
+        window_name = window.get('kCGWindowName', '')
+        owner_name = window.get('kCGWindowOwnerName', '')
+
+        # Check both window name and owner name
+        if (self.window_name.lower() not in window_name.lower() and
+                self.window_name.lower() not in owner_name.lower()):
+            return None
+
+        bounds = window.get('kCGWindowBounds', {})
+        width = bounds.get('Width', 0)
+        height = bounds.get('Height', 0)
+
+        return {
+            'id': window.get('kCGWindowNumber'),
+            'name': window_name,
+            'owner': owner_name,
+            'bounds': bounds,
+            'is_onscreen': window.get('kCGWindowIsOnscreen', False),
+            'size': width * height
+        }
+
     def _find_window(self) -> Optional[Dict[str, Any]]:
         """
         Find window by name.
 
+        The on-screen window found last time is re-checked with a single-window
+        lookup; the full window list is only searched if it went away.
+
         Returns:
             Dict with window info (id, name, owner, bounds) or None if not found
         """
-        window_list = CGWindowListCopyWindowInfo(
-            kCGWindowListOptionAll,
-            kCGNullWindowID
-        )
-
+        if self._cached_window_id is not None:
+            window_list = CGWindowListCopyWindowInfo(
+                kCGWindowListOptionIncludingWindow,
+                self._cached_window_id
+            )
+            for window in window_list or ():
+                window_info = self._match_window(window)
+                if window_info and window_info['is_onscreen']:
+                    return window_info
+            self._cached_window_id = None
+
+        # Search on-screen windows first, then all windows
         matching_windows = []
-
-        for window in window_list:
-            window_name = window.get('kCGWindowName', '')
-            owner_name = window.get('kCGWindowOwnerName', '')
-
-            # Check both window name and owner name
-            if (self.window_name.lower() in window_name.lower() or
-                self.window_name.lower() in owner_name.lower()):
-                bounds = window.get('kCGWindowBounds', {})
-                width = bounds.get('Width', 0)
-                height = bounds.get('Height', 0)
-
-                matching_windows.append({
-                    'id': window.get('kCGWindowNumber'),
-                    'name': window_name,
-                    'owner': owner_name,
-                    'bounds': bounds,
-                    'is_onscreen': window.get('kCGWindowIsOnscreen', False),
-                    'size': width * height
-                })
+        for option in (kCGWindowListOptionOnScreenOnly | kCGWindowListExcludeDesktopElements,
+                       kCGWindowListOptionAll):
+            window_list = CGWindowListCopyWindowInfo(option, kCGNullWindowID)
+            matching_windows = [w for w in map(self._match_window, window_list or ()) if w]
+            if matching_windows:
+                break
 
         if not matching_windows:
             return None
@@ -140,22 +240,27 @@ class ScreenMonitor:
         onscreen_windows = [w for w in matching_windows if w['is_onscreen']]
 
         if onscreen_windows:
-            return max(onscreen_windows, key=lambda w: w['size'])
+            window_info = max(onscreen_windows, key=lambda w: w['size'])
+            self._cached_window_id = window_info['id']
+            return window_info
         else:
             return max(matching_windows, key=lambda w: w['size'])
 
-    def _capture_window(self, window_id: int) -> Optional[Image.Image]:
+    def _capture_window(self, window_id: int, rect=CGRectNull) -> Optional[tuple]:
         """
         Capture screenshot of window.
 
         Args:
             window_id: Window ID to capture
+            rect: Screen rectangle to capture (default: the whole window)
 
         Returns:
-            PIL Image or None if capture failed
+            Tuple of (BGR pixel array of shape (height, width, 3), CGImage)
+            or None if capture failed. Without NumPy the pixels are an RGB
+            PIL Image instead.
         """
         image_ref = CGWindowListCreateImage(
-            CGRectNull,
+            rect,
             kCGWindowListOptionIncludingWindow,
             window_id,
             kCGWindowImageBoundsIgnoreFraming
@@ -164,7 +269,9 @@ class ScreenMonitor:
         if not image_ref:
             return None
 
-        # Convert CGImage to PIL Image
+        # View the CGImage's BGRA bytes as an array, without a channel swap.
+        # Rows may be padded, so slice off anything past the image width, and
+        # leave out the unused alpha byte (a strided view, nothing is copied).
         width = Quartz.CGImageGetWidth(image_ref)
         height = Quartz.CGImageGetHeight(image_ref)
         bytes_per_row = Quartz.CGImageGetBytesPerRow(image_ref)
@@ -172,96 +279,234 @@ class ScreenMonitor:
         data_provider = Quartz.CGImageGetDataProvider(image_ref)
         pixel_data = Quartz.CGDataProviderCopyData(data_provider)
 
-        image = Image.frombytes(
-            'RGBA',
-            (width, height),
-            pixel_data,
-            'raw',
-            'BGRA',
-            bytes_per_row
-        )
+        if not NUMPY_AVAILABLE:
+            image = Image.frombytes('RGB', (width, height), pixel_data, 'raw', 'BGRX', bytes_per_row)
+            return image, image_ref
 
-        return image
+        pixels = np.frombuffer(pixel_data, dtype=np.uint8)
+        return pixels.reshape(height, bytes_per_row // 4, 4)[:, :width, :3], image_ref
 
-    def _extract_region(self, image: Image.Image) -> Optional[Image.Image]:
+    def _capture_region(self, window_info: Dict[str, Any]) -> Optional[tuple]:
         """
-        Extract monitoring region from image.
+        Capture only the monitoring region of a window.
+
+        region_size is in image pixels but window bounds are in points, so the
+        first capture takes the whole window to learn the display scale. Later
+        captures ask Quartz for just the region's rectangle.
 
         Args:
-            image: Full window screenshot
+            window_info: Window info from _find_window
 
         Returns:
-            Cropped region or None if image too small
+            Tuple of (BGR region array, region CGImage) or None if capture failed
         """
+        bounds = window_info['bounds']
         region_width, region_height = self.region_size
 
-        if image.width < region_width or image.height < region_height:
-            logger.warning(f"Image too small for region: {image.width}x{image.height}")
+        if self._scale is None:
+            capture = self._capture_window(window_info['id'])
+            if capture is None or not bounds.get('Width'):
+                return None
+            image, image_ref = capture
+            image_width, image_height = _image_size(image)
+            self._scale = image_width / bounds['Width']
+
+            region = self._extract_region(image)
+            if region is None:
+                return None
+            x, y = self._region_offset(image_width, image_height, region_width, region_height)
+            region_ref = Quartz.CGImageCreateWithImageInRect(
+                image_ref, Quartz.CGRectMake(x, y, region_width, region_height)
+            )
+            return region, region_ref
+
+        width = region_width / self._scale
+        height = region_height / self._scale
+        if bounds['Width'] < width or bounds['Height'] < height:
+            logger.warning(f"Window too small for region: {bounds['Width']}x{bounds['Height']}")
             return None
 
-        # Calculate region coordinates based on position
+        offset = self._region_offset(bounds['Width'], bounds['Height'], width, height)
+        if offset is None:
+            return None
+
+        rect = Quartz.CGRectMake(bounds['X'] + offset[0], bounds['Y'] + offset[1], width, height)
+        capture = self._capture_window(window_info['id'], rect)
+
+        # Display scale changed (e.g. window moved to another screen)
+        captured_size = _image_size(capture[0]) if capture is not None else None
+        if captured_size and (abs(captured_size[0] - region_width) > 1 or
+                              abs(captured_size[1] - region_height) > 1):
+            self._scale = None
+            return self._capture_region(window_info)
+
+        return capture
+
+    def _region_offset(self, width: float, height: float,
+                       region_width: float, region_height: float) -> Optional[tuple]:
+        """
+        Calculate the top-left offset of the monitoring region.
+
+        Args:
+            width, height: Size of the window or image
+            region_width, region_height: Size of the region, in the same units
+
+        Returns:
+            Tuple of (x, y) or None if region_position is unknown
+        """
         if self.region_position == "bottom-right":
-            x = image.width - region_width
-            y = image.height - region_height
+            return width - region_width, height - region_height
         elif self.region_position == "top-right":
-            x = image.width - region_width
-            y = 0
+            return width - region_width, 0
         elif self.region_position == "bottom-left":
-            x = 0
-            y = image.height - region_height
+            return 0, height - region_height
         elif self.region_position == "top-left":
-            x = 0
-            y = 0
-        else:
-            logger.error(f"Unknown region position: {self.region_position}")
-            return None
+            return 0, 0
 
-        return image.crop((x, y, x + region_width, y + region_height))
+        logger.error(f"Unknown region position: {self.region_position}")
+        return None
 
-    def _color_distance(self, color1: tuple, color2: tuple) -> float:
+    def _extract_region(self, image) -> Optional[Any]:
         """
-        Calculate Euclidean distance between two RGB colors.
+        Extract monitoring region from image.
 
         Args:
-            color1: RGB tuple (r, g, b)
-            color2: RGB tuple (r, g, b)
+            image: Full window screenshot as a BGR array
 
         Returns:
-            Distance value (0 = identical)
+            Cropped region or None if image too small
         """
-        r1, g1, b1 = color1
-        r2, g2, b2 = color2
-        return ((r2 - r1) ** 2 + (g2 - g1) ** 2 + (b2 - b1) ** 2) ** 0.5
+        region_width, region_height = self.region_size
+        image_width, image_height = _image_size(image)
+
+        if image_width < region_width or image_height < region_height:
+            logger.warning(f"Image too small for region: {image_width}x{image_height}")
+            return None
+
+        # Calculate region coordinates based on position
+        offset = self._region_offset(image_width, image_height, region_width, region_height)
+        if offset is None:
+            return None
+
+        x, y = offset
+        if not NUMPY_AVAILABLE:
+            return image.crop((x, y, x + region_width, y + region_height))
+        return image[y:y + region_height, x:x + region_width]
 
-    def _detect_color(self, region: Image.Image) -> tuple:
+    def _to_image(self, region) -> Image.Image:
+        """Convert a BGR region to an RGB PIL Image (for OCR and debug output)."""
+        if not NUMPY_AVAILABLE:
+            return region
+        return Image.fromarray(np.ascontiguousarray(region[:, :, 2::-1]), 'RGB')
+
+    def _sample_region(self, region):
+        """
+        Copy every DETECTION_STRIDE-th pixel of the region into a reused buffer.
+
+        Notification popups are large blobs, so the sample is enough for
+        detection. This single pass yields a small contiguous BGR image that
+        the frame-diff gate, the region hash and color detection all share.
+
+        Args:
+            region: BGR image region
+
+        Returns:
+            Sampled BGR image (RGB bytes without NumPy)
+        """
+        if not NUMPY_AVAILABLE:
+            size = (max(1, region.width // DETECTION_STRIDE), max(1, region.height // DETECTION_STRIDE))
+            return region.resize(size, Image.NEAREST).tobytes()
+
+        view = region[::DETECTION_STRIDE, ::DETECTION_STRIDE]
+        sample = self._spare_sample
+        if sample is None or sample.shape != view.shape:
+            sample = np.empty(view.shape, dtype=np.uint8)
+        np.copyto(sample, view)
+        return sample
+
+    def _detect_color(self, sampled: "np.ndarray") -> tuple:
         """
         Detect notification color in region.
 
         Args:
-            region: Image region to analyze
+            sampled: BGR region sample from _sample_region
 
         Returns:
-            Tuple of (detected: bool, matching_pixels: int)
+            Tuple of (detected: bool, matching_pixels: int). Without debug
+            logging the count stops once the threshold is reached.
         """
-        # Convert to RGB if needed
-        if region.mode != 'RGB':
-            region = region.convert('RGB')
+        target = self._target_bgr_arr
+        lo = self._bbox_lo
+        hi = self._bbox_hi
+        tol_sq = self._tol_sq
+        min_samples = self._min_samples
+
+        # Only the threshold decision matters unless debug logging shows
+        # the full count, so stop counting once detection is certain
+        limit = 0 if logger.isEnabledFor(logging.DEBUG) else min_samples
+
+        # Pixels within color_tolerance (Euclidean) of the notification
+        # color, compared as B,G,R against the pre-swapped target
+        matching_samples = count_matches(sampled, target, lo, hi, tol_sq, limit)
+        detected = matching_samples >= min_samples
+
+        # Report full-resolution estimates
+        matching_pixels = matching_samples * DETECTION_STRIDE * DETECTION_STRIDE
+        total_pixels = sampled.shape[0] * sampled.shape[1] * DETECTION_STRIDE * DETECTION_STRIDE
+        percentage = (matching_pixels / total_pixels) * 100
 
-        # Count pixels matching notification color
-        pixels = region.load()
-        matching_pixels = 0
-        total_pixels = region.width * region.height
+        logger.debug(f"Color detection: {matching_pixels}/{total_pixels} pixels "
+                    f"({percentage:.1f}%) match {self.notification_color}, "
+                    f"detected={detected}")
 
-        for x in range(region.width):
-            for y in range(region.height):
-                pixel_color = pixels[x, y][:3]  # RGB only (ignore alpha)
-                distance = self._color_distance(pixel_color, self.notification_color)
+        return (detected, matching_pixels)
 
-                if distance <= self.color_tolerance:
-                    matching_pixels += 1
+    def _detect_color_bytes(self, sampled: bytes) -> tuple:
+        """
+        Detect notification color in region without NumPy.
 
-        percentage = (matching_pixels / total_pixels) * 100
-        detected = matching_pixels >= self.min_pixels
+        Args:
+            sampled: RGB region sample from _sample_region
+
+        Returns:
+            Tuple of (detected: bool, matching_pixels: int), with the count
+            cut short as in _detect_color
+        """
+        target_r, target_g, target_b = self.notification_color
+        tol = self.color_tolerance
+        tol_sq = self._tol_sq
+        min_samples = self._min_samples
+
+        # Cheap early-out: every channel needs at least min_samples values
+        # within tolerance before the per-pixel pass can find enough matches
+        histogram = Image.frombytes('RGB', (len(sampled) // 3, 1), sampled).histogram()
+        for offset, value in zip((0, 256, 512), self.notification_color):
+            lo = offset + max(0, value - tol)
+            hi = offset + min(255, value + tol)
+            if sum(histogram[lo:hi + 1]) < min_samples:
+                logger.debug("Color detection: histogram pre-screen found no candidates")
+                return (False, 0)
+
+        # Stop once detection is certain, unless debug logging shows the count
+        limit = 0 if logger.isEnabledFor(logging.DEBUG) else min_samples
+
+        # Iterate the channels as ints via byte slices, no per-pixel tuples
+        matching_samples = 0
+        for r, g, b in zip(sampled[0::3], sampled[1::3], sampled[2::3]):
+            dr = r - target_r
+            dg = g - target_g
+            db = b - target_b
+            if (-tol <= dr <= tol and -tol <= dg <= tol and -tol <= db <= tol and
+                    dr * dr + dg * dg + db * db <= tol_sq):
+                matching_samples += 1
+                if matching_samples == limit:
+                    break
+        detected = matching_samples >= min_samples
+
+        # Report full-resolution estimates
+        matching_pixels = matching_samples * DETECTION_STRIDE * DETECTION_STRIDE
+        total_pixels = len(sampled) // 3 * DETECTION_STRIDE * DETECTION_STRIDE
+        percentage = (matching_pixels / total_pixels) * 100 if total_pixels else 0.0
 
         logger.debug(f"Color detection: {matching_pixels}/{total_pixels} pixels "
                     f"({percentage:.1f}%) match {self.notification_color}, "
@@ -269,12 +514,12 @@ class ScreenMonitor:
 
         return (detected, matching_pixels)
 
-    def _extract_text_from_region(self, region: Image.Image) -> str:
+    def _extract_text_from_region(self, region_ref) -> str:
         """
         Extract text from region using OCR.
 
         Args:
-            region: Image region to analyze
+            region_ref: CGImage of the region to analyze
 
         Returns:
             Extracted text (empty string if OCR not available or no text found)
@@ -283,18 +528,13 @@ class ScreenMonitor:
             return ""
 
         try:
-            # Save region to temp file
-            temp_path = "/tmp/espresso_ocr.png"
-            region.save(temp_path)
-
             # Create OCR request
             request = Vision.VNRecognizeTextRequest.alloc().init()
             request.setRecognitionLevel_(Vision.VNRequestTextRecognitionLevelAccurate)
             request.setUsesLanguageCorrection_(True)
 
-            # Load image
-            url = NSURL.fileURLWithPath_(temp_path)
-            handler = Vision.VNImageRequestHandler.alloc().initWithURL_options_(url, None)
+            # Read the captured image directly from memory
+            handler = Vision.VNImageRequestHandler.alloc().initWithCGImage_options_(region_ref, None)
 
             # Perform OCR
             success = handler.performRequests_error_([request], None)
@@ -336,29 +576,18 @@ class ScreenMonitor:
         if not lines:
             return ""
 
-        # Filter out common UI elements
-        ignore_keywords = [
-            'Microsoft Teams',
-            'Schnelle Antwort senden',
-            'Online mit Microsoft Exchange',
-            'len',
-            'SL',
-            '100 %',
-            '+',
-        ]
-
         filtered_lines = []
         found_sender = False
 
         for line in lines:
-            # Skip lines with ignore keywords
-            if any(keyword in line for keyword in ignore_keywords):
+            # Skip lines with ignore keywords (common UI elements)
+            if IGNORE_RE.search(line):
                 continue
 
             # Skip time patterns (HH:MM or DD.MM.YYYY)
             if ':' in line and len(line) < 10:  # Like "15:16"
                 continue
-            if '.' in line and line.replace('.', '').replace(' ', '').isdigit():  # Like "08.01.2026"
+            if DATE_RE.fullmatch(line):  # Like "08.01.2026"
                 continue
 
             # Look for sender pattern: (Gast) Name or just Name
@@ -384,7 +613,7 @@ class ScreenMonitor:
         if self.last_detection_time is None:
             return True
 
-        elapsed = time.time() - self.last_detection_time
+        elapsed = time.monotonic() - self.last_detection_time
         return elapsed >= self.detection_cooldown
 
     def _scan_once(self) -> bool:
@@ -402,47 +631,73 @@ class ScreenMonitor:
             logger.warning(f"Window '{self.window_name}' not found")
             return False
 
-        # Capture screenshot
-        image = self._capture_window(window_info['id'])
-        if not image:
+        # Capture monitoring region
+        capture = self._capture_region(window_info)
+        if capture is None:
             # Only log every 10th failure to avoid spam
             if self.scan_count % 10 == 0:
                 logger.warning(f"Failed to capture window {window_info['id']} (scan #{self.scan_count})")
             return False
-
-        # Extract monitoring region
-        region = self._extract_region(image)
-        if not region:
+        region, region_ref = capture
+
+        # Skip detection entirely while the region is unchanged, unless a
+        # notification on screen still has to be reported (cooldown or a
+        # failed callback). The two sample buffers alternate between current
+        # and previous scan.
+        sample = self._sample_region(region)
+        if NUMPY_AVAILABLE:
+            unchanged = self._last_sample is not None and np.array_equal(sample, self._last_sample)
+        else:
+            unchanged = sample == self._last_sample
+        if unchanged and not self._pending_detection:
+            self._spare_sample = sample
+            self._idle_streak += 1
+            logger.debug(f"Scan #{self.scan_count}: region unchanged")
             return False
+        self._spare_sample, self._last_sample = self._last_sample, sample
+        self._idle_streak = 0
+        frame_key = hashlib.blake2b(sample, digest_size=8).digest()
 
-        # Save debug screenshot if enabled
+        # Save debug screenshot if enabled (unchanged regions were saved already).
+        # PNG encoding runs on a worker thread while this scan continues.
         if self.debug_screenshots:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"screen_monitor_debug_{timestamp}.png"
-            try:
-                region.save(filename)
-                logger.debug(f"Saved debug screenshot: {filename}")
-            except Exception as e:
-                logger.error(f"Failed to save debug screenshot: {e}")
+            if self._debug_executor is None:
+                self._debug_executor = ThreadPoolExecutor(max_workers=1,
+                                                          thread_name_prefix="screen-debug")
+            self._debug_executor.submit(self._save_debug_screenshot, region, filename)
 
         # Detect notification
-        detected = False
-        matching_pixels = 0
         notification_text = ""
 
-        if self.detection_method == "color":
-            detected, matching_pixels = self._detect_color(region)
-            logger.debug(f"Scan #{self.scan_count}: {matching_pixels:,} matching pixels, "
-                        f"detected={detected}")
-
-            # If detected, extract text via OCR
-            if detected and OCR_AVAILABLE:
-                notification_text = self._extract_text_from_region(region)
-                if notification_text:
-                    logger.info(f"OCR extracted: {notification_text[:100]}")
+        # Regions seen recently (e.g. toggling between two states) reuse
+        # their earlier result
+        cached = self._detection_cache.get(frame_key)
+        if cached is not None:
+            self._detection_cache.move_to_end(frame_key)
+            detected, matching_pixels = cached
         else:
-            logger.error(f"Unknown detection method: {self.detection_method}")
-            return False
+            detected, matching_pixels = self._detect_fn(sample)
+            self._detection_cache[frame_key] = (detected, matching_pixels)
+            if len(self._detection_cache) > DETECTION_CACHE_SIZE:
+                self._detection_cache.popitem(last=False)
+        logger.debug(f"Scan #{self.scan_count}: {matching_pixels:,} matching pixels, "
+                    f"detected={detected}")
+
+        # If detected, extract text via OCR
+        if detected and OCR_AVAILABLE:
+            # The same popup is often captured again on later scans
+            notification_text = self._ocr_cache.get(frame_key)
+            if notification_text is None:
+                notification_text = self._extract_text_from_region(region_ref)
+                self._ocr_cache[frame_key] = notification_text
+                if len(self._ocr_cache) > OCR_CACHE_SIZE:
+                    self._ocr_cache.popitem(last=False)
+            else:
+                self._ocr_cache.move_to_end(frame_key)
+            if notification_text:
+                logger.info(f"OCR extracted: {notification_text[:100]}")
 
         if detected:
             logger.info(f"🔔 Notification detected via screen monitoring! "
@@ -454,6 +709,7 @@ class ScreenMonitor:
 
             # Call callback if registered and cooldown passed
             if self.callback:
+                self._pending_detection = True
                 if self._should_trigger():
                     print(f"[SCREEN_MONITOR] Calling callback...")
                     try:
@@ -466,7 +722,8 @@ class ScreenMonitor:
                         })
                         print(f"[SCREEN_MONITOR] Callback called successfully")
                         # Update last detection time AFTER successful callback
-                        self.last_detection_time = time.time()
+                        self.last_detection_time = time.monotonic()
+                        self._pending_detection = False
                     except Exception as e:
                         logger.error(f"Callback error: {e}", exc_info=True)
                         print(f"[SCREEN_MONITOR] Callback error: {e}")
@@ -476,9 +733,40 @@ class ScreenMonitor:
                     print(f"[SCREEN_MONITOR] Cooldown active, not triggering")
             else:
                 print(f"[SCREEN_MONITOR] No callback registered!")
+        else:
+            self._pending_detection = False
 
         return detected
 
+    def _save_debug_screenshot(self, region, filename: str):
+        """
+        Save a region as a PNG file.
+
+        Args:
+            region: BGR region array (RGB PIL Image without NumPy)
+            filename: Output path
+        """
+        try:
+            self._to_image(region).save(filename)
+            logger.debug(f"Saved debug screenshot: {filename}")
+        except Exception as e:
+            logger.error(f"Failed to save debug screenshot: {e}")
+
+    def _next_interval(self) -> float:
+        """
+        Seconds to wait before the next scan.
+
+        Backs off exponentially while the region stays unchanged and returns
+        to scan_interval as soon as it changes.
+
+        Returns:
+            Sleep duration in seconds
+        """
+        if self._idle_streak == 0:
+            return self.scan_interval
+        backoff = self.scan_interval * 2 ** min(self._idle_streak, IDLE_BACKOFF_STEPS)
+        return max(self.scan_interval, min(backoff, MAX_SCAN_INTERVAL))
+
     def start(self, callback: Optional[Callable] = None):
         """
         Start monitoring loop.
@@ -494,17 +782,22 @@ class ScreenMonitor:
         self.callback = callback
         self.running = True
         self.last_detection_time = None
+        self._idle_streak = 0
+        self._pending_detection = False
 
         logger.info(f"Screen monitor started: scanning every {self.scan_interval}s")
 
         try:
             while self.running:
                 self._scan_once()
-                time.sleep(self.scan_interval)
+                time.sleep(self._next_interval())
         except KeyboardInterrupt:
             logger.info("Screen monitor interrupted")
         finally:
             self.running = False
+            if self._debug_executor is not None:
+                self._debug_executor.shutdown(wait=True)
+                self._debug_executor = None
             logger.info("Screen monitor stopped")
 
     def stop(self):
@@ -4,9 +4,25 @@ Utility functions for app discovery and window management
 import subprocess
 from typing import List, Tuple
 
+# Query apps in-process when PyObjC is installed; AppleScript otherwise
+try:
+    from AppKit import NSWorkspace, NSApplicationActivationPolicyProhibited
+    PYOBJC_AVAILABLE = True
+except ImportError:
+    PYOBJC_AVAILABLE = False
+
 
 def get_running_apps() -> List[str]:
     """Get list of running applications"""
+    if PYOBJC_AVAILABLE:
+        # Same set as System Events' "background only is false"
+        return [
+            app.localizedName()
+            for app in NSWorkspace.sharedWorkspace().runningApplications()
+            if app.activationPolicy() != NSApplicationActivationPolicyProhibited
+            and app.localizedName()
+        ]
+
     script = '''
     tell application "System Events"
         set appList to name of every process whose background only is false
@@ -22,6 +38,10 @@ def get_running_apps() -> List[str]:
 
 def get_active_app() -> str:
     """Get currently active application"""
+    if PYOBJC_AVAILABLE:
+        app = NSWorkspace.sharedWorkspace().frontmostApplication()
+        return app.localizedName() if app else ""
+
     script = '''
     tell application "System Events"
         set frontApp to name of first application process whose frontmost is true
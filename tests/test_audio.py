@@ -73,6 +73,7 @@ try:
         channels=1,
         samplerate=44100,
         blocksize=2048,
+        dtype='float32',
         callback=audio_callback
     ):
         while True:
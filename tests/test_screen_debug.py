@@ -5,6 +5,7 @@ Debug script for screen monitoring - shows detailed detection info
 import sys
 import time
 from datetime import datetime
+from pathlib import Path
 
 try:
     import Quartz
@@ -22,6 +23,20 @@ except ImportError:
     print("❌ Error: Pillow not installed")
     sys.exit(1)
 
+try:
+    import numpy as np
+except ImportError:
+    print("❌ Error: numpy not installed")
+    sys.exit(1)
+
+# Use the same matching kernel as the screen monitor
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from espresso._screen_kernels import count_matches
+
+# Sampling step for color matching, as in espresso.screen_monitor
+DETECTION_STRIDE = 4
+
 
 def hex_to_rgb(hex_color: str) -> tuple:
     """Convert hex color to RGB tuple."""
@@ -29,13 +44,6 @@ def hex_to_rgb(hex_color: str) -> tuple:
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
 
-def color_distance(color1: tuple, color2: tuple) -> float:
-    """Calculate Euclidean distance between two RGB colors."""
-    r1, g1, b1 = color1
-    r2, g2, b2 = color2
-    return ((r2 - r1) ** 2 + (g2 - g1) ** 2 + (b2 - b1) ** 2) ** 0.5
-
-
 def find_window(target_name: str):
     """Find window by name."""
     window_list = CGWindowListCopyWindowInfo(
@@ -75,7 +83,7 @@ def find_window(target_name: str):
 
 
 def capture_window(window_id: int):
-    """Capture screenshot of window."""
+    """Capture screenshot of window as a BGRA array of shape (height, width, 4)."""
     image_ref = CGWindowListCreateImage(
         CGRectNull,
         kCGWindowListOptionIncludingWindow,
@@ -93,50 +101,39 @@ def capture_window(window_id: int):
     data_provider = Quartz.CGImageGetDataProvider(image_ref)
     pixel_data = Quartz.CGDataProviderCopyData(data_provider)
 
-    image = Image.frombytes(
-        'RGBA',
-        (width, height),
-        pixel_data,
-        'raw',
-        'BGRA',
-        bytes_per_row
-    )
-
-    return image
+    # View the bytes directly; rows may be padded past the image width
+    pixels = np.frombuffer(pixel_data, dtype=np.uint8)
+    return pixels.reshape(height, bytes_per_row // 4, 4)[:, :width]
 
 
-def analyze_region(region: Image.Image, target_color: tuple, tolerance: int):
-    """Analyze region and show detailed color statistics."""
-    # Convert to RGB
-    if region.mode != 'RGB':
-        region = region.convert('RGB')
+def analyze_region(region: np.ndarray, target_color: tuple, tolerance: int):
+    """Analyze RGB region array and show detailed color statistics."""
+    total_pixels = region.shape[0] * region.shape[1]
 
-    pixels = region.load()
-    matching_pixels = 0
-    total_pixels = region.width * region.height
+    # Squared Euclidean distance against tolerance**2 on every
+    # DETECTION_STRIDE-th pixel, compiled with numba when available
+    small = region[::DETECTION_STRIDE, ::DETECTION_STRIDE]
+    target = np.array(target_color, dtype=np.int64)
+    lo = np.clip(target - tolerance, 0, 255).astype(np.uint8)
+    hi = np.clip(target + tolerance, 0, 255).astype(np.uint8)
+    matching_samples = count_matches(small, target, lo, hi, tolerance * tolerance)
 
-    # Color histogram
-    color_counts = {}
+    # Full-resolution estimate
+    matching_pixels = matching_samples * DETECTION_STRIDE * DETECTION_STRIDE
 
-    for x in range(region.width):
-        for y in range(region.height):
-            pixel_color = pixels[x, y][:3]
-            distance = color_distance(pixel_color, target_color)
-
-            if distance <= tolerance:
-                matching_pixels += 1
-
-            # Count top colors (sample every 10th pixel)
-            if x % 10 == 0 and y % 10 == 0:
-                color_key = f"#{pixel_color[0]:02x}{pixel_color[1]:02x}{pixel_color[2]:02x}"
-                color_counts[color_key] = color_counts.get(color_key, 0) + 1
+    # Color histogram (sample every 10th pixel), with RGB packed into one int
+    sub = region[::10, ::10].astype(np.uint32)
+    keys = (sub[..., 0] << 16) | (sub[..., 1] << 8) | sub[..., 2]
+    values, counts = np.unique(keys.ravel(), return_counts=True)
 
     percentage = (matching_pixels / total_pixels) * 100
 
     # Top 5 colors
-    top_colors = sorted(color_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+    top = np.argsort(-counts, kind='stable')[:5]
+    top_colors = [(f"#{int(values[i]):06x}", int(counts[i])) for i in top]
 
     return {
+        'matching_samples': matching_samples,
         'matching_pixels': matching_pixels,
         'total_pixels': total_pixels,
         'percentage': percentage,
@@ -155,6 +152,7 @@ def main():
         target_name = sys.argv[1]
 
     target_color = hex_to_rgb(target_color_hex)
+    min_samples = max(1, min_pixels // (DETECTION_STRIDE * DETECTION_STRIDE))
 
     # BIGGER REGION - 3x taller AND 2x wider!
     region_width, region_height = 1000, 750
@@ -173,55 +171,73 @@ def main():
 
     scan_count = 0
 
+    # Window ID from the last successful capture, so the window list is
+    # only enumerated again once capturing it fails
+    window_id = None
+
+    # Detection result and top colors of the last saved region
+    saved_state = None
+
     try:
         while True:
             scan_count += 1
             timestamp = datetime.now().strftime("%H:%M:%S")
 
-            # Find window
-            window_info = find_window(target_name)
-            if not window_info:
-                print(f"[{timestamp}] ❌ Window not found")
+            # Capture the cached window; if it is gone, look it up again
+            image = capture_window(window_id) if window_id is not None else None
+            if image is None:
+                window_id = None
+
+                # Find window
+                window_info = find_window(target_name)
+                if not window_info:
+                    print(f"[{timestamp}] ❌ Window not found")
+                    time.sleep(2)
+                    continue
+
+                # Capture
+                image = capture_window(window_info['id'])
+                if image is None:
+                    print(f"[{timestamp}] ❌ Capture failed")
+                    time.sleep(2)
+                    continue
+                window_id = window_info['id']
+
+            # Extract region (BGRA -> RGB as a view, nothing is copied)
+            height, width = image.shape[:2]
+            if width < region_width or height < region_height:
+                print(f"[{timestamp}] ❌ Image too small: {width}x{height}")
                 time.sleep(2)
                 continue
 
-            # Capture
-            image = capture_window(window_info['id'])
-            if not image:
-                print(f"[{timestamp}] ❌ Capture failed")
-                time.sleep(2)
-                continue
-
-            # Extract region
-            if image.width < region_width or image.height < region_height:
-                print(f"[{timestamp}] ❌ Image too small: {image.width}x{image.height}")
-                time.sleep(2)
-                continue
-
-            x = image.width - region_width
-            y = image.height - region_height
-            region = image.crop((x, y, image.width, image.height))
+            x = width - region_width
+            y = height - region_height
+            region = image[y:, x:, 2::-1]
 
             # Analyze
             stats = analyze_region(region, target_color, tolerance)
 
             # Print results
-            detected = stats['matching_pixels'] >= min_pixels
+            detected = stats['matching_samples'] >= min_samples
             icon = "🔔" if detected else "⚪"
 
             print(f"[{timestamp}] Scan #{scan_count} {icon}")
-            print(f"  Matching pixels: {stats['matching_pixels']:,} / {stats['total_pixels']:,} ({stats['percentage']:.2f}%)")
+            print(f"  Matching pixels: ~{stats['matching_pixels']:,} / {stats['total_pixels']:,} ({stats['percentage']:.2f}%)")
             print(f"  Detection: {'✅ YES' if detected else '❌ NO'} (threshold: {min_pixels})")
             print(f"  Top colors in region:")
             for color, count in stats['top_colors']:
                 print(f"    {color}: {count} samples")
             print()
 
-            # Save every scan to check later
-            filename = f"debug_region_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            region.save(filename)
-            print(f"  💾 Saved: {filename}")
-            print()
+            # Save to check later, but only when the detection result or the
+            # top colors changed since the last saved region
+            state = (detected, tuple(color for color, _ in stats['top_colors']))
+            if state != saved_state:
+                filename = f"debug_region_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+                Image.fromarray(np.ascontiguousarray(region), 'RGB').save(filename, compress_level=1)
+                saved_state = state
+                print(f"  💾 Saved: {filename}")
+                print()
 
             time.sleep(2)
 
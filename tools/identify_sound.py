@@ -4,15 +4,18 @@ Identify notification sounds in real-time
 """
 import sounddevice as sd
 import numpy as np
+import queue
 import sys
+import threading
 import time
+import traceback
 from pathlib import Path
-from collections import deque
 
 # Add espresso to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from espresso.audio_fingerprint import AudioFingerprint
+from espresso._audio_kernels import ring_write
 
 
 def main():
@@ -56,68 +59,106 @@ def main():
     buffer_size = int(sample_rate * buffer_duration)
 
     # Ring buffer for audio
-    audio_buffer = deque(maxlen=buffer_size)
+    ring = np.zeros(buffer_size, dtype=np.float32)
+    write_idx = 0
+    filled = 0
+
+    def get_ordered():
+        """Buffered samples, oldest first"""
+        if filled < buffer_size:
+            return ring[:filled].copy()
+        return np.roll(ring, -write_idx)
 
     # Detection state
-    last_detection_time = 0
     detection_cooldown = 2.0  # Don't re-identify for 2 seconds
     threshold = 0.02
 
-    # Peak tracking
-    peak_level = 0.0
-    last_peak_time = time.time()
+    # The audio callback only hands blocks over; buffering, level display
+    # and identification run on a worker thread so the audio thread never
+    # blocks on printing or sleeping
+    blocks = queue.SimpleQueue()
 
-    def audio_callback(indata, frames, time_info, status):
-        nonlocal peak_level, last_peak_time, last_detection_time
+    # Set when the worker exits, so the main thread stops waiting for it
+    worker_stopped = threading.Event()
+
+    def add_block(indata, status):
+        nonlocal write_idx, filled
 
         if status:
             print(f"Status: {status}")
 
-        # Add to buffer
-        for sample in indata:
-            audio_buffer.append(sample[0])
-
-        # Calculate RMS
-        rms = np.sqrt(np.mean(indata**2))
-
-        # Track peak
-        now = time.time()
-        if rms > peak_level:
-            peak_level = rms
-            last_peak_time = now
-
-        # Reset peak after 0.5 seconds
-        if now - last_peak_time > 0.5:
-            peak_level = 0.0
-
-        # Visual feedback
-        detection_level = max(rms, peak_level)
-        bar_length = int(detection_level * 100)
-        bar = "█" * min(bar_length, 50)
+        # Add to buffer and calculate RMS in one pass
+        write_idx, rms = ring_write(ring, write_idx, indata)
+        filled = min(filled + len(indata), buffer_size)
+        return rms
+
+    def process_audio():
+        try:
+            identify_loop()
+        except Exception:
+            print("\n\n❌ Audio processing failed:")
+            traceback.print_exc()
+        finally:
+            worker_stopped.set()
+
+    def identify_loop():
+        last_detection_time = 0
+
+        # Peak tracking
+        peak_level = 0.0
+        last_peak_time = time.time()
+
+        while True:
+            rms = add_block(*blocks.get())
+
+            # Track peak
+            now = time.time()
+            if rms > peak_level:
+                peak_level = rms
+                last_peak_time = now
+
+            # Reset peak after 0.5 seconds
+            if now - last_peak_time > 0.5:
+                peak_level = 0.0
+
+            # Visual feedback
+            detection_level = max(rms, peak_level)
+            bar_length = int(detection_level * 100)
+            bar = "█" * min(bar_length, 50)
+
+            peak_bar_length = int(peak_level * 100)
+            peak_bar = "▓" * min(peak_bar_length, 50)
+
+            print(f"\rLevel: {rms:.4f} {bar:<50} Peak: {peak_level:.4f} {peak_bar:<50}", end='', flush=True)
+
+            # Check for sound above threshold
+            if detection_level > threshold and (now - last_detection_time) > detection_cooldown:
+                # Wait a bit to capture the full sound, then buffer what arrived
+                time.sleep(0.3)
+                while True:
+                    try:
+                        add_block(*blocks.get_nowait())
+                    except queue.Empty:
+                        break
+
+                # Get audio from buffer
+                audio_data = get_ordered()
+
+                if len(audio_data) > sample_rate * 0.1:  # At least 100ms
+                    # Try to identify
+                    sound_name, confidence = fp.identify_sound(audio_data, sample_rate, min_confidence=0.6)
+
+                    if sound_name:
+                        print(f"\n🔔 IDENTIFIED: {sound_name} (confidence: {confidence:.2%})")
+                    else:
+                        print(f"\n❓ Unknown sound (best match confidence: {confidence:.2%})")
+
+                    last_detection_time = now
 
-        peak_bar_length = int(peak_level * 100)
-        peak_bar = "▓" * min(peak_bar_length, 50)
-
-        print(f"\rLevel: {rms:.4f} {bar:<50} Peak: {peak_level:.4f} {peak_bar:<50}", end='', flush=True)
-
-        # Check for sound above threshold
-        if detection_level > threshold and (now - last_detection_time) > detection_cooldown:
-            # Wait a bit to capture the full sound
-            time.sleep(0.3)
-
-            # Get audio from buffer
-            audio_data = np.array(list(audio_buffer))
-
-            if len(audio_data) > sample_rate * 0.1:  # At least 100ms
-                # Try to identify
-                sound_name, confidence = fp.identify_sound(audio_data, sample_rate, min_confidence=0.6)
-
-                if sound_name:
-                    print(f"\n🔔 IDENTIFIED: {sound_name} (confidence: {confidence:.2%})")
-                else:
-                    print(f"\n❓ Unknown sound (best match confidence: {confidence:.2%})")
+    def audio_callback(indata, frames, time_info, status):
+        blocks.put((indata.copy(), status))
 
-                last_detection_time = now
+    threading.Thread(target=process_audio, daemon=True).start()
 
     # Start listening
     try:
@@ -126,12 +167,16 @@ def main():
             channels=1,
             samplerate=sample_rate,
             blocksize=block_size,
+            dtype='float32',
             callback=audio_callback
         ):
-            while True:
-                time.sleep(0.1)
+            # Block until Ctrl+C or the worker dies, without waking up periodically
+            worker_stopped.wait()
     except KeyboardInterrupt:
         print("\n\n✋ Stopped")
+        return
+
+    sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -50,24 +50,33 @@ def main():
     # Record
     sample_rate = 44100
     duration = 2.0
-    audio_buffer = []
+    block_size = 1024
+
+    # Preallocated with room for one extra block, since the stream runs
+    # slightly longer than the sleep
+    audio_buffer = np.zeros((int(sample_rate * duration) + block_size, 1), dtype=np.float32)
+    write_idx = 0
 
     def callback(indata, frames, time_info, status):
-        audio_buffer.append(indata.copy())
+        nonlocal write_idx
+        n = min(len(indata), len(audio_buffer) - write_idx)
+        audio_buffer[write_idx:write_idx + n] = indata[:n]
+        write_idx += n
 
     stream = sd.InputStream(
         device=device_id,
         channels=1,
         samplerate=sample_rate,
-        blocksize=1024,
+        blocksize=block_size,
+        dtype='float32',
         callback=callback
     )
 
     with stream:
         time.sleep(duration)
 
-    # Concatenate buffer
-    audio_data = np.concatenate(audio_buffer, axis=0)
+    # Recorded part of the buffer
+    audio_data = audio_buffer[:write_idx]
 
     # Check if we got audio
     rms = np.sqrt(np.mean(audio_data**2))
@@ -82,7 +91,7 @@ def main():
 
     # Find the actual sound in the buffer (trim silence)
     threshold = rms * 2
-    above_threshold = np.abs(audio_data.flatten()) > threshold
+    above_threshold = np.abs(audio_data[:, 0]) > threshold
 
     if np.any(above_threshold):
         start_idx = np.argmax(above_threshold)
@@ -100,7 +109,7 @@ def main():
 
     # Learn the sound
     fp = AudioFingerprint()
-    fp.learn_sound(sound_name, audio_data.flatten(), sample_rate)
+    fp.learn_sound(sound_name, audio_data[:, 0], sample_rate)
 
     print("")
     print(f"🎉 Sound '{sound_name}' learned successfully!")
@@ -4,10 +4,9 @@ Update Homebrew tap with latest release information.
 
 This script:
 1. Fetches the latest release from espresso-macos
-2. Downloads the ZIP file
-3. Calculates SHA256 checksum
-4. Updates the Cask file in homebrew-tap repository
-5. Optionally commits and pushes the changes
+2. Downloads the ZIP file and calculates its SHA256 checksum
+3. Updates the Cask file in homebrew-tap repository
+4. Optionally commits and pushes the changes
 """
 
 import argparse
@@ -15,26 +14,32 @@ import hashlib
 import json
 import os
 import re
+import shlex
 import subprocess
 import sys
-import tempfile
 from pathlib import Path
-from urllib.request import urlretrieve
+from urllib.request import urlopen
+
+# Fields rewritten in the Cask file
+VERSION_RE = re.compile(r'version\s+"[^"]+"')
+SHA256_RE = re.compile(r'sha256\s+"[^"]+"')
 
 
 def run_command(cmd, capture=True, check=True):
-    """Run a shell command and optionally capture output."""
+    """Run a command (argv list or string, no shell) and optionally capture output."""
+    if isinstance(cmd, str):
+        cmd = shlex.split(cmd)
+
     if capture:
         result = subprocess.run(
             cmd,
-            shell=True,
             capture_output=True,
             text=True,
             check=check
         )
         return result.stdout.strip()
     else:
-        subprocess.run(cmd, shell=True, check=check)
+        subprocess.run(cmd, check=check)
         return None
 
 
@@ -45,7 +50,7 @@ def get_latest_release():
     try:
         # Try gh CLI first
         output = run_command(
-            'gh release view --repo slauger/espresso-macos --json tagName,url',
+            ['gh', 'release', 'view', '--repo', 'slauger/espresso-macos', '--json', 'tagName,url'],
             check=False
         )
 
@@ -63,7 +68,7 @@ def get_latest_release():
     # Fallback: try to parse from git tags
     print("🔍 Trying to get version from git tags...")
     try:
-        tags = run_command('git tag --list "v*" --sort=-version:refname')
+        tags = run_command(['git', 'tag', '--list', 'v*', '--sort=-version:refname'])
         if tags:
             latest_tag = tags.split('\n')[0]
             version = latest_tag.lstrip('v')
@@ -77,36 +82,35 @@ def get_latest_release():
     sys.exit(1)
 
 
-def download_zip(version):
-    """Download the ZIP file for the given version."""
+def calculate_sha256(f):
+    """Calculate SHA256 checksum of a binary file object."""
+    if hasattr(hashlib, 'file_digest'):
+        # Python 3.11+: read and hash in C
+        sha256_hash = hashlib.file_digest(f, 'sha256')
+    else:
+        sha256_hash = hashlib.sha256()
+        for byte_block in iter(lambda: f.read(1024 * 1024), b""):
+            sha256_hash.update(byte_block)
+
+    return sha256_hash.hexdigest()
+
+
+def download_and_hash(version):
+    """Download the ZIP file for the given version and return its SHA256."""
     url = f"https://github.com/slauger/espresso-macos/releases/download/v{version}/Espresso-{version}-macOS.zip"
 
     print(f"⬇️  Downloading {url}...")
+    print(f"🔐 Calculating SHA256...")
 
-    # Create temp file
-    temp_dir = tempfile.gettempdir()
-    zip_path = os.path.join(temp_dir, f"espresso-{version}.zip")
-
+    # Hash the archive as it streams in, without writing it to disk
     try:
-        urlretrieve(url, zip_path)
-        print(f"✅ Downloaded to {zip_path}")
-        return zip_path
+        with urlopen(url) as response:
+            checksum = calculate_sha256(response)
     except Exception as e:
         print(f"❌ Download failed: {e}")
         print(f"   Make sure the release exists: {url}")
         sys.exit(1)
 
-
-def calculate_sha256(file_path):
-    """Calculate SHA256 checksum of a file."""
-    print(f"🔐 Calculating SHA256...")
-
-    sha256_hash = hashlib.sha256()
-    with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-
-    checksum = sha256_hash.hexdigest()
     print(f"✅ SHA256: {checksum}")
     return checksum
 
@@ -125,18 +129,10 @@ def update_cask_file(tap_path, version, sha256):
     content = cask_file.read_text()
 
     # Update version
-    content = re.sub(
-        r'version\s+"[^"]+"',
-        f'version "{version}"',
-        content
-    )
+    content = VERSION_RE.sub(f'version "{version}"', content)
 
     # Update SHA256
-    content = re.sub(
-        r'sha256\s+"[^"]+"',
-        f'sha256 "{sha256}"',
-        content
-    )
+    content = SHA256_RE.sub(f'sha256 "{sha256}"', content)
 
     # Write back
     cask_file.write_text(content)
@@ -146,7 +142,7 @@ def update_cask_file(tap_path, version, sha256):
     # Show diff
     print("\n📋 Changes:")
     try:
-        diff = run_command(f'cd {tap_path} && git diff Casks/espresso.rb', check=False)
+        diff = run_command(['git', '-C', str(tap_path), 'diff', 'Casks/espresso.rb'], check=False)
         if diff:
             print(diff)
         else:
@@ -160,7 +156,7 @@ def commit_and_push(tap_path, version, dry_run=False):
     os.chdir(tap_path)
 
     # Check if there are changes
-    status = run_command('git status --porcelain', check=False)
+    status = run_command(['git', 'status', '--porcelain'], check=False)
     if not status:
         print("✅ No changes to commit")
         return
@@ -173,11 +169,11 @@ def commit_and_push(tap_path, version, dry_run=False):
         return
 
     print(f"\n💾 Committing changes...")
-    run_command('git add Casks/espresso.rb', capture=False)
-    run_command(f'git commit -m "{commit_message}"', capture=False)
+    run_command(['git', 'add', 'Casks/espresso.rb'], capture=False)
+    run_command(['git', 'commit', '-m', commit_message], capture=False)
 
     print(f"🚀 Pushing to remote...")
-    run_command('git push', capture=False)
+    run_command(['git', 'push'], capture=False)
 
     print("✅ Changes committed and pushed")
 
@@ -239,11 +235,8 @@ def main():
 
     print()
 
-    # Download ZIP
-    zip_path = download_zip(version)
-
-    # Calculate SHA256
-    sha256 = calculate_sha256(zip_path)
+    # Download ZIP and calculate SHA256
+    sha256 = download_and_hash(version)
 
     print()
 
@@ -262,12 +255,6 @@ def main():
     else:
         print(f"\n💡 To commit and push, run with --commit flag")
 
-    # Cleanup
-    try:
-        os.remove(zip_path)
-    except:
-        pass
-
     print("\n✅ Done!")
 
 